@@ -0,0 +1,98 @@
+"""Cold-start benchmark of the dashboard.
+
+Profiles the import time of every module imported by ``src/app.py`` with
+``python -X importtime`` and times the first headless run of the script in a
+fresh interpreter. Exits with status 1 when the cold start exceeds the budget.
+
+    python benchmarks/cold_start.py --budget-ms 4000
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT, 'src')
+APP_PATH = os.path.join(SRC_DIR, 'app.py')
+
+# Runs the script once the way a new session would, in a fresh interpreter
+FIRST_RUN = f"""
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({APP_PATH!r}, default_timeout=600).run()
+assert not app.exception, app.exception
+print(time.perf_counter() - start)
+"""
+
+
+def _environment():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [SRC_DIR, env.get('PYTHONPATH')]))
+    return env
+
+
+def top_level_imports(path=APP_PATH):
+    """Names of the modules imported at the top level of a script, in order."""
+    with open(path) as file:
+        tree = ast.parse(file.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def import_times(modules):
+    """Cumulative import time in milliseconds of every module, each in a fresh interpreter.
+
+    A fresh interpreter per module keeps modules shared with earlier imports
+    from being counted as free.
+    """
+    times = {}
+    for module in modules:
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                capture_output=True, text=True, env=_environment(), cwd=ROOT, check=True)
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == module:
+                times[module] = int(fields[1]) / 1000
+    return times
+
+
+def first_run_time():
+    """Seconds from starting a fresh interpreter until the first script run has finished."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', FIRST_RUN],
+                            capture_output=True, text=True, env=_environment(), cwd=ROOT)
+    elapsed = time.perf_counter() - start
+    if result.returncode:
+        sys.exit(result.stderr)
+    return elapsed, float(result.stdout.split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile the cold start of the dashboard.')
+    parser.add_argument('--budget-ms', type=float, default=4000, help='maximum cold-start time in milliseconds')
+    args = parser.parse_args()
+
+    times = import_times(top_level_imports())
+    print('Import time per module (ms):')
+    for module, ms in sorted(times.items(), key=lambda item: -item[1]):
+        print(f'  {module:30} {ms:10.1f}')
+
+    total, script = first_run_time()
+    print(f'First run: {total * 1000:.0f} ms including interpreter start, {script * 1000:.0f} ms script run')
+    print(f'Budget: {args.budget_ms:.0f} ms')
+    if total * 1000 > args.budget_ms:
+        print('Cold start over budget')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Latency and memory of the price lookup under concurrent dashboard sessions.
+
+Simulates ``--sessions`` threads that each rerun the price lookup of the
+Ingredients Costing section ``--reruns`` times, once with a parse of the
+supplier file per session and once reading the process-wide shared price
+index. The parsing sessions rerun a tenth as often to keep the run short.
+Midway through the shared run the supplier file is rewritten, so the index
+is refreshed under load:
+
+    python benchmarks/concurrent_sessions.py --sessions 50 --reruns 20 --rows 100000
+"""
+import argparse
+import os
+import shutil
+import sys
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import numpy as np
+
+import synthetic
+from price_index import SharedPriceIndex
+from recipes import load_recipes
+from supplier import price_index, price_vector, read_offers, select_best_offers
+
+DATA_DIR = os.path.join(ROOT, 'benchmarks', '.data')
+
+
+def run_sessions(sessions, reruns, lookup, midway=None):
+    """Run ``lookup`` ``reruns`` times in each of ``sessions`` threads.
+
+    Returns the latencies in seconds and the peak of the traced memory in
+    bytes. The first session calls ``midway`` once after half of its reruns.
+    """
+    latencies = [[] for _ in range(sessions)]
+    start = threading.Barrier(sessions + 1)
+
+    def session(s):
+        start.wait()
+        for rerun in range(reruns):
+            if s == 0 and rerun == reruns // 2 and midway is not None:
+                midway()
+            begin = time.perf_counter()
+            lookup()
+            latencies[s].append(time.perf_counter() - begin)
+
+    threads = [threading.Thread(target=session, args=(s,)) for s in range(sessions)]
+    tracemalloc.start()
+    for thread in threads:
+        thread.start()
+    start.wait()
+    for thread in threads:
+        thread.join()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return np.concatenate(latencies), peak
+
+
+def report(name, latencies, peak):
+    p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+    print(f'{name:20} {p50:10.3f} {p95:10.3f} {peak / 2**20:12.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the price lookup under concurrent sessions.')
+    parser.add_argument('--sessions', type=int, default=50, help='concurrent sessions')
+    parser.add_argument('--reruns', type=int, default=20, help='reruns per session')
+    parser.add_argument('--rows', type=int, default=100_000, help='offer rows of the synthetic supplier file')
+    args = parser.parse_args()
+
+    products = load_recipes().products
+    source = synthetic.write_supplier_file(os.path.join(DATA_DIR, f'supplier-{args.rows}.csv'), args.rows)
+    changed = synthetic.write_supplier_file(os.path.join(DATA_DIR, f'supplier-{args.rows}-1.csv'), args.rows, seed=1)
+    path = os.path.join(DATA_DIR, 'concurrent-supplier.csv')
+    shutil.copyfile(source, path)
+
+    def per_session():
+        # What every session did before: its own parse and selection of the supplier file
+        return price_vector(price_index(select_best_offers(read_offers(path))), products)
+
+    shared = SharedPriceIndex(store_dir=os.path.join(DATA_DIR, 'no-store'), csv_path=path, check_interval=0)
+    shared.snapshot()
+
+    def refresh():
+        # Replace the supplier file while the sessions are reading, like a new delivery of offers
+        shutil.copyfile(changed, path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+    print(f'{args.sessions} sessions x {args.reruns} reruns on {args.rows:,} offers')
+    print(f"{'lookup':20} {'p50 ms':>10} {'p95 ms':>10} {'peak MiB':>12}")
+    report('per-session parse', *run_sessions(args.sessions, max(1, args.reruns // 10), per_session))
+    rebuilds = shared.rebuilds
+    report('shared index', *run_sessions(args.sessions, args.reruns,
+                                         lambda: shared.snapshot().vector(products), refresh))
+    print(f'Shared index rebuilt {shared.rebuilds - rebuilds} time(s) while the sessions were reading')
+
+
+if __name__ == '__main__':
+    main()
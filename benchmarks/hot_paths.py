@@ -0,0 +1,191 @@
+"""Benchmarks of the costing and break-even hot paths.
+
+Times loading a supplier file, selecting the latest/cheapest offers, as-of
+price lookups over the offer history, planning the purchase of pack sizes
+across suppliers, also of awkward coprime pack sizes, the costing and break-even of recipe sets of growing size
+and building the payload sent to the browser (figure JSON and flow graph DOT).
+Results are saved as benchmarks/results/<commit>.json and can be compared with
+an earlier run:
+
+    python benchmarks/hot_paths.py --rows 1000 100000 --products 50 300 --recipes 3 300
+    python benchmarks/hot_paths.py --compare benchmarks/results/<commit>.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import numpy as np
+import pandas as pd
+import plotly.io
+
+import synthetic
+from charts import break_even_figure, ingredient_demand_figure, product_bar_figure
+from flow import flow_graph, flow_nodes
+from history import PriceHistory
+from model import default_outlet, evaluate, model_graph
+from procurement import current_offers, plan_purchases
+from recipes import RecipeBook
+from supplier import price_index, price_vector, read_offers, select_best_offers
+
+DATA_DIR = os.path.join(ROOT, 'benchmarks', '.data')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+
+def best_time(function, repeat):
+    """Fastest of ``repeat`` calls in seconds and the result of the last call."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def supplier_benchmarks(rows, repeat):
+    path = synthetic.write_supplier_file(os.path.join(DATA_DIR, f'supplier-{rows}.csv'), rows)
+    load, offers = best_time(lambda: read_offers(path), repeat)
+    select, best_offers = best_time(lambda: select_best_offers(offers), repeat)
+
+    # Monthly demand of every product of the synthetic file covered by packs of the current offers
+    supplier_offers = current_offers(offers)
+    products = synthetic.product_names(offers['Product'].nunique())
+    demand = pd.Series(np.random.default_rng(0).uniform(0, 5000, len(products)), index=products)
+    purchase, _ = best_time(lambda: plan_purchases(supplier_offers, demand, best_offers), repeat)
+
+    # Prices of random products as of random days of the offer period
+    history = PriceHistory(offers)
+    rng = np.random.default_rng(0)
+    lookup_products = np.array(history.products, dtype=object)[rng.integers(0, len(history.products), rows)]
+    lookup_dates = np.datetime64(synthetic.FIRST_DAY) + rng.integers(0, synthetic.DAYS, rows)
+    as_of, _ = best_time(lambda: history.lookup(lookup_products, lookup_dates), repeat)
+    return [
+        {'benchmark': 'load offers', 'size': rows, 'seconds': load},
+        {'benchmark': 'select best offers', 'size': rows, 'seconds': select},
+        {'benchmark': 'purchase plan', 'size': rows, 'seconds': purchase},
+        {'benchmark': 'as-of price lookups', 'size': rows, 'seconds': as_of},
+    ]
+
+
+def packing_benchmarks(products, repeat):
+    # Demands of up to two tonnes covered by packs of awkward gram sizes
+    offers = synthetic.pack_offers(products)
+    naive_offers = offers.groupby('Product', sort=False).head(1)
+    demand = pd.Series(np.random.default_rng(0).uniform(0, 2e6, products), index=synthetic.product_names(products))
+    purchase, _ = best_time(lambda: plan_purchases(offers, demand, naive_offers), repeat)
+    return [{'benchmark': 'awkward packs plan', 'size': products, 'seconds': purchase}]
+
+
+def model_benchmarks(recipes, repeat):
+    book = RecipeBook(synthetic.recipes(recipes))
+    prices = price_vector(price_index(select_best_offers(read_offers(
+        synthetic.write_supplier_file(os.path.join(DATA_DIR, 'supplier-10000.csv'), 10_000)))), book.products)
+    outlet = default_outlet(book)
+
+    costing, result = best_time(lambda: evaluate(outlet, prices), repeat)
+
+    # Break-even after a change of the rent, recomputing only the nodes downstream of it
+    graph = model_graph()
+    for name, value in [('quantities', book.quantities), ('prices', prices), ('daily_demand', book.daily_demand),
+                        ('selling_prices', book.selling_prices), ('cooking_minutes', book.cooking_minutes),
+                        ('rates', [('Hourly Rate', outlet.hourly_rate)]), ('rent', outlet.rent), ('salary', outlet.salary)]:
+        graph.set(name, value)
+    graph.get('be_lines')
+    rents = iter(np.arange(1e6))
+
+    def break_even():
+        graph.set('rent', next(rents))
+        return graph.get('be_lines')
+
+    break_even_time, _ = best_time(break_even, repeat)
+
+    def payload():
+        # Figures are built uncached like on a rerun with new data
+        figures = [
+            ingredient_demand_figure.__wrapped__(tuple(book.names), tuple(book.products), book.uses,
+                                                 book.quantities * book.daily_demand[:, None], 30),
+            product_bar_figure.__wrapped__(tuple(book.names), result.monthly_cost, 'Monthly Cost', 'Cost'),
+            break_even_figure.__wrapped__(tuple(book.names), *graph.get('be_lines'), result.be_units, result.unit_vc,
+                                          result.avg_fixed_cost),
+        ]
+        values = {key: graph.get(key) for key in flow_nodes(graph)}
+        dot = flow_graph(tuple(book.codes), tuple(book.products)).source(values)
+        return sum(len(plotly.io.to_json(figure, validate=False)) for figure in figures) + len(dot)
+
+    payload_time, payload_bytes = best_time(payload, repeat)
+    return [
+        {'benchmark': 'costing', 'size': recipes, 'seconds': costing},
+        {'benchmark': 'break-even', 'size': recipes, 'seconds': break_even_time},
+        {'benchmark': 'render payload', 'size': recipes, 'seconds': payload_time, 'bytes': payload_bytes},
+    ]
+
+
+def commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results, previous):
+    """Print the results next to an earlier run."""
+    earlier = {(row['benchmark'], row['size']): row['seconds'] for row in previous['results']}
+    print(f"\n{'benchmark':20} {'size':>10} {'seconds':>12} {previous['commit']:>12} {'ratio':>8}")
+    for row in results:
+        before = earlier.get((row['benchmark'], row['size']))
+        ratio = f'{row["seconds"] / before:8.2f}' if before else ''
+        before = f'{before:12.6f}' if before else ''
+        print(f"{row['benchmark']:20} {row['size']:>10} {row['seconds']:12.6f} {before:>12} {ratio}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the costing and break-even hot paths.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10**3, 10**4, 10**5, 10**6],
+                        help='offer rows of the synthetic supplier files, up to 10**7')
+    parser.add_argument('--products', type=int, nargs='+', default=[50, 300],
+                        help='products of the awkward pack size purchase plans')
+    parser.add_argument('--recipes', type=int, nargs='+', default=[3, 30, 300], help='recipes of the synthetic menus')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per benchmark, the fastest counts')
+    parser.add_argument('--compare', help='results file of an earlier run')
+    args = parser.parse_args()
+
+    results = []
+    for rows in args.rows:
+        results.extend(supplier_benchmarks(rows, args.repeat))
+    for products in args.products:
+        results.extend(packing_benchmarks(products, args.repeat))
+    for recipes in args.recipes:
+        results.extend(model_benchmarks(recipes, args.repeat))
+
+    for row in results:
+        extra = f"  {row['bytes']:,} bytes" if 'bytes' in row else ''
+        print(f"{row['benchmark']:20} {row['size']:>10,} {row['seconds'] * 1000:12.3f} ms{extra}")
+
+    run = {
+        'commit': commit(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'results': results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{run['commit']}.json")
+    with open(path, 'w') as file:
+        json.dump(run, file, indent=2)
+    print(f'Results saved to {os.path.relpath(path, ROOT)}')
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Memory of the supplier offers in memory, per million offers.
+
+Compares the table as pandas reads a supplier file by default (Python string
+objects, decimal commas kept as text) with the compact schema of
+``supplier.read_offers``:
+
+    python benchmarks/offer_memory.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import pandas as pd
+
+import synthetic
+from supplier import read_offers
+
+DATA_DIR = os.path.join(ROOT, 'benchmarks', '.data')
+
+
+def column_memory(df):
+    """Bytes of every column including the Python objects it refers to."""
+    return df.memory_usage(deep=True, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report the memory of the supplier offers per million offers.')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='offer rows of the synthetic supplier file')
+    args = parser.parse_args()
+
+    path = synthetic.write_supplier_file(os.path.join(DATA_DIR, f'supplier-{args.rows}.csv'), args.rows)
+    raw = column_memory(pd.read_csv(path, sep=';'))
+    offers = read_offers(path)
+    compact = column_memory(offers)
+
+    scale = 1_000_000 / args.rows / 2**20
+    report = pd.DataFrame({
+        'Raw MiB': raw * scale,
+        'Compact MiB': compact * scale,
+        'Compact dtype': offers.dtypes.astype(str),
+    })
+    report.loc['Total'] = [raw.sum() * scale, compact.sum() * scale, '']
+    print(f'Memory per million offers, measured on {args.rows:,} offers')
+    print(report.to_string(float_format='{:,.1f}'.format))
+    print(f'Compact schema uses {compact.sum() / raw.sum():.1%} of the raw table')
+
+
+if __name__ == '__main__':
+    main()
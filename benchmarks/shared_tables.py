@@ -0,0 +1,76 @@
+"""Load time and memory of the supplier offers in many processes.
+
+Every process either parses the supplier file itself or memory-maps the Arrow
+table written by ``arrow_store``. Anonymous memory is private to a process,
+while the file-backed pages of a mapped table are shared by all processes
+through the page cache:
+
+    python benchmarks/shared_tables.py --rows 1000000 --processes 4
+
+Linux only, the memory is read from /proc/self/status.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import numpy as np
+
+import synthetic
+from arrow_store import load_shared_offers, table_path
+from supplier import read_offers
+
+DATA_DIR = os.path.join(ROOT, 'benchmarks', '.data')
+
+
+def resident_memory():
+    """Anonymous and file-backed resident memory of this process in bytes."""
+    with open('/proc/self/status') as file:
+        fields = dict(line.split(':', 1) for line in file)
+    return [int(fields[name].split()[0]) * 1024 for name in ['RssAnon', 'RssFile']]
+
+
+def load(method, csv_path, arrow_dir):
+    """Seconds and growth of the anonymous and file-backed memory of loading the offers once."""
+    anonymous, file_backed = resident_memory()
+    start = time.perf_counter()
+    offers = read_offers(csv_path) if method == 'parse' else load_shared_offers(csv_path, arrow_dir)
+    # Every column is read once, like a selection of the best offers does
+    for column in offers.columns:
+        np.asarray(offers[column]).max()
+    seconds = time.perf_counter() - start
+    after = resident_memory()
+    return seconds, after[0] - anonymous, after[1] - file_backed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare parsing the supplier file per process with a shared Arrow table.')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='offer rows of the synthetic supplier file')
+    parser.add_argument('--processes', type=int, default=4, help='processes loading the offers')
+    args = parser.parse_args()
+
+    csv_path = synthetic.write_supplier_file(os.path.join(DATA_DIR, f'supplier-{args.rows}.csv'), args.rows)
+    with tempfile.TemporaryDirectory(dir=DATA_DIR) as arrow_dir:
+        start = time.perf_counter()
+        load_shared_offers(csv_path, arrow_dir)
+        print(f'Arrow table of {args.rows:,} offers written once in {time.perf_counter() - start:.2f} s, '
+              f'{os.path.getsize(table_path("offers", csv_path, arrow_dir)) / 2**20:.1f} MiB')
+
+        print(f"{'load':8} {'seconds':>10} {'private MiB':>12} {'shared MiB':>11}  per process, {args.processes} processes")
+        context = multiprocessing.get_context('spawn')
+        for method in ['parse', 'map']:
+            with ProcessPoolExecutor(args.processes, mp_context=context) as pool:
+                results = np.array(list(pool.map(load, [method] * args.processes, [csv_path] * args.processes,
+                                                 [arrow_dir] * args.processes)))
+            seconds, private, shared = results.mean(axis=0)
+            print(f'{method:8} {seconds:10.3f} {private / 2**20:12.1f} {shared / 2**20:11.1f}')
+
+
+if __name__ == '__main__':
+    main()
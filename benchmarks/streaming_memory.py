@@ -0,0 +1,57 @@
+"""Peak memory of selecting the best offers of growing supplier files.
+
+Compares reading the whole file with ``supplier.read_offers`` before selecting
+the latest/cheapest offers with the chunked ``streaming.stream_best_offers``.
+The peak of the streaming pass stays flat as the file grows:
+
+    python benchmarks/streaming_memory.py --rows 100000 1000000 4000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import pandas as pd
+
+import synthetic
+from streaming import CHUNK_ROWS, stream_best_offers
+from supplier import read_offers, select_best_offers
+
+DATA_DIR = os.path.join(ROOT, 'benchmarks', '.data')
+
+
+def traced(function):
+    """Seconds, peak of the traced memory in bytes and result of ``function()``."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the peak memory of in-memory and streaming offer selection.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10**5, 10**6, 4 * 10**6],
+                        help='offer rows of the synthetic supplier files')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='offer rows per chunk')
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'file MiB':>10} {'in-memory MiB':>14} {'streaming MiB':>14} {'in-memory s':>12} {'streaming s':>12}")
+    for rows in args.rows:
+        path = synthetic.write_supplier_file(os.path.join(DATA_DIR, f'supplier-{rows}.csv'), rows)
+        memory_time, memory_peak, expected = traced(lambda: select_best_offers(read_offers(path)))
+        stream_time, stream_peak, result = traced(lambda: stream_best_offers(path, args.chunk_rows))
+        pd.testing.assert_frame_equal(result, expected, check_categorical=False)
+        print(f'{rows:12,} {os.path.getsize(path) / 2**20:10.1f} {memory_peak / 2**20:14.1f} '
+              f'{stream_peak / 2**20:14.1f} {memory_time:12.2f} {stream_time:12.2f}')
+    print('Both passes select the same best offers')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Synthetic supplier files and recipe sets for the benchmarks.
+
+Supplier files look like data/supplier-ingredients.CSV: semicolon separated
+with decimal commas. Even suppliers write zero padded day-first dates
+(07.08.2021), odd suppliers unpadded month-first dates (8.7.2021).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+# Products of the bundled recipes come first so the real menu finds prices
+MENU_PRODUCTS = ['Avocado', 'Lime', 'Red Chili', 'Onion', 'Coriander', 'Mayonnaise', 'Tomato', 'Garlic',
+                 'Jalapeno Chili', 'Tabasco']
+UNITS = ['PCS', 'G', 'ML']
+
+# Awkward pack sizes in grams, coprime pairs among them make long pack mixes
+AWKWARD_PACK_SIZES = [250, 454, 997, 1000, 1500]
+
+# Offers are spread over this many days starting with FIRST_DAY
+FIRST_DAY = '2020-01-01'
+DAYS = 1000
+
+
+def product_names(count):
+    return MENU_PRODUCTS[:count] + [f'Product {p:05d}' for p in range(len(MENU_PRODUCTS), count)]
+
+
+def supplier_offers(rows, products=200, suppliers=50, seed=0):
+    """A raw supplier offer table of ``rows`` offers as the strings of a supplier file."""
+    rng = np.random.default_rng(seed)
+    names = np.array(product_names(products))
+    product = rng.integers(0, products, rows)
+    supplier = rng.integers(0, suppliers, rows)
+    quantity = rng.choice([1, 5, 10, 25], rows)
+    base_price = rng.uniform(0.01, 3.0, products)
+    price_per_unit = np.round(base_price[product] * rng.uniform(0.8, 1.2, rows), 4)
+
+    # Both date styles of the supplier files, formatted once per day
+    days = pd.date_range(FIRST_DAY, periods=DAYS)
+    day_first = np.array([f'{day.day:02d}.{day.month:02d}.{day.year}' for day in days])
+    month_first = np.array([f'{day.month}.{day.day}.{day.year}' for day in days])
+    day = rng.integers(0, DAYS, rows)
+
+    return pd.DataFrame({
+        'Product-ID': 10001 + product,
+        'Product': names[product],
+        'Unit': np.array(UNITS)[product % len(UNITS)],
+        'Supplier': np.char.add('Supplier ', supplier.astype(str)),
+        'Quantity': quantity,
+        'Price per Quantity': np.round(price_per_unit * quantity, 4),
+        'Price per Unit': price_per_unit,
+        'Date of Offer': np.where(supplier % 2 == 0, day_first[day], month_first[day]),
+    })
+
+
+def pack_offers(products, pack_sizes=AWKWARD_PACK_SIZES, seed=0):
+    """Current offers of ``products`` products in grams, one supplier per pack size at nearly the same unit price."""
+    rng = np.random.default_rng(seed)
+    names = np.repeat(product_names(products), len(pack_sizes))
+    quantity = np.tile(pack_sizes, products)
+    price_per_unit = np.repeat(rng.uniform(0.001, 0.03, products), len(pack_sizes)) * rng.uniform(0.95, 1.05, len(names))
+    return pd.DataFrame({
+        'Product': names,
+        'Unit': 'G',
+        'Supplier': np.tile([f'Supplier {s}' for s in range(len(pack_sizes))], products),
+        'Quantity': quantity,
+        'Price per Quantity': np.round(price_per_unit * quantity, 2),
+    })
+
+
+def write_supplier_file(path, rows, products=200, suppliers=50, seed=0):
+    """Write a synthetic supplier file unless it exists already, returns the path."""
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        supplier_offers(rows, products, suppliers, seed).to_csv(tmp_path, sep=';', decimal=',', index=False,
+                                                                float_format='%.4f')
+        os.replace(tmp_path, path)
+    return path
+
+
+def recipes(count, products=200, ingredients=6, seed=0):
+    """A recipe registry of ``count`` recipes using ``ingredients`` of the first ``products`` products each."""
+    rng = np.random.default_rng(seed)
+    names = product_names(products)
+    menu = []
+    for r in range(count):
+        chosen = rng.choice(products, size=min(ingredients, products), replace=False)
+        menu.append({
+            'code': f'R{r}',
+            'name': f'Recipe {r}',
+            'daily_demand': int(rng.integers(1, 50)),
+            'selling_price': float(np.round(rng.uniform(8, 15), 2)),
+            'ingredients': [{'product': names[i], 'quantity': float(np.round(rng.uniform(0.5, 50), 1)),
+                             'unit': UNITS[i % len(UNITS)]} for i in chosen],
+            'steps': [{'minutes': int(rng.integers(1, 10)), 'seconds': 0, 'description': ''}],
+        })
+    return menu
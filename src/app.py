@@ -1,16 +1,48 @@
-import graphviz
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
+import numpy as np
 import os
-import random
-import networkx as nx
-import matplotlib.pyplot as plt
+from arrow_store import shared_offers_table
+from charts import (break_even_figure, demand_figure, heatmap_figure, histogram_figure, ingredient_demand_figure,
+                    product_bar_figure, profit_gauge_figure)
+from costing import DAYS_PER_MONTH
+from flow import dag_source, flow_nodes
+from history import load_price_history
+from model import model_graph
+from price_index import shared_price_index
+from procurement import (demand_rollup, load_current_offers, order_sheet, plan_purchases, supplier_units,
+                         unit_factors)
+from profiling import SectionTimer, export, stats
+from recipes import load_recipes
+from sections import flow_graph_section, simulation_section
+from supplier import SUPPLIER_CSV_PATH, file_key
+from sweep import sweep
+
+# Emojis shown next to the ingredient prices
+PRODUCT_EMOJIS = {
+    'Avocado': '🥑',
+    'Coriander': '🌱',
+    'Garlic': '🧄',
+    'Jalapeno Chili': '🫑',
+    'Lime': '🍋‍🟩',
+    'Mayonnaise': '🫙',
+    'Onion': '🧅',
+    'Red Chili': '🌶️',
+    'Tabasco': '🥫',
+    'Tomato': '🍅',
+}
+
+# Upper bound of the rent and salary inputs and of the rent sweep
+MAX_FIXED_COST = 20000.0
+
+# Offer rows shown in the supplier table, larger files are previewed by their first rows
+SUPPLIER_TABLE_ROWS = 10_000
 
-def display_ingredient_cost(ingredient_quantity, ingredient_cost, ingredient_name, unit):
-    ingredient_cost_recipe = float(ingredient_quantity) * float(ingredient_cost.replace(',', '.'))
+def format_price(price):
+    # Supplier prices are shown with a decimal comma
+    return f"{price:.4f}".replace('.', ',')
 
+def display_ingredient_cost(ingredient_quantity, ingredient_cost_recipe, ingredient_name, unit):
     # Format the output with commas
     formatted_ingredient_quantity = f"{ingredient_quantity:.1f}".replace('.', ',')
     formatted_cost_ingredient = f"{ingredient_cost_recipe:.3f}".replace('.', ',')
@@ -21,1071 +53,433 @@ def display_ingredient_cost(ingredient_quantity, ingredient_cost, ingredient_nam
         unsafe_allow_html=True
     )
 
-    return ingredient_cost_recipe
-
-# Page layout
-st.set_page_config(layout="wide")
-
-# Title
-st.markdown("<h1 style='text-align: center;'>Break Even Analysis Holly Guacamole</h1>", unsafe_allow_html=True)
-
-# Add a divider
-st.divider()
-
-# Enter recipe ingredients
-st.sidebar.header("Guacamole Recipe Ingredients")
-with st.sidebar.expander("Enter Guacamole Recipe Ingredients", expanded=False):
-    # Entering thai guacamole recipe
-    st.markdown("<h4 style='text-align: center;'>Thai Guacamole</h4>", unsafe_allow_html=True)
-    avocado_thai = st.number_input('Avocado in Pcs.', min_value=0.0, max_value=100.0, value=2.0)
-    lime_thai = st.number_input('Lime in Pcs.', min_value=0.0, max_value=100.0, value=0.5)
-    red_chili_thai = st.number_input('Red Chili in Grams', min_value=0.0, max_value=100.0, value=3.0)
-    onion_thai = st.number_input('Onion in Grams', min_value=0.0, max_value=100.0, value=25.0)
-    coriander_thai = st.number_input('Coriander in Grams', min_value=0.0, max_value=100.0, value=8.0)
-
-    # Entering kid friendly guacamole recipe
-    st.markdown("<h4 style='text-align: center;'>Kid Friendly Guacamole</h4>", unsafe_allow_html=True)
-    avocado_kid = st.number_input('Avocados in Pcs.', min_value=0.0, max_value=100.0, value=2.0)
-    lime_kid = st.number_input('Limes in Pcs.', min_value=0.0, max_value=100.0, value=0.5)
-    mayonnaise_kid = st.number_input('Mayonnaise in Grams', min_value=0.0, max_value=100.0, value=30.0)
-    tomato_kid = st.number_input('Tomato in Grams', min_value=0.0, max_value=100.0, value=80.0)
-    garlic_kid = st.number_input('Garlic in Grams', min_value=0.0, max_value=100.0, value=7.0)
-
-    # Entering fiery guacamole recipe
-    st.markdown("<h4 style='text-align: center;'>Fiery Guacamole</h4>", unsafe_allow_html=True)
-    avocado_fiery = st.number_input('Avocado in Pc.', min_value=0.0, max_value=100.0, value=2.0)
-    lime_fiery = st.number_input('Lime in Pc.', min_value=0.0, max_value=100.0, value=0.5)
-    jalapeno_chili_fiery = st.number_input('Jalapenos in Grams', min_value=0.0, max_value=100.0, value=6.0)
-    onion_fiery = st.number_input('Onions in Grams', min_value=0.0, max_value=100.0, value=25.0)
-    tobasco_fiery = st.number_input('Tobasco in ml', min_value=0.0, max_value=100.0, value=4.0)
-
-# Enter recipe ingredients
-st.sidebar.header("Guacamole Per Day Demand")
-with st.sidebar.expander("Enter Guacamole Per Day Demand", expanded=False):
-    # Enter recipe demand
-    thai_demand = st.number_input('Thai Guacamole Per Day Demand', min_value=0, max_value=1000, value=15)
-    kid_demand = st.number_input('Kid Friendly Guacamole Per Day Demand', min_value=0, max_value=1000, value=28)
-    fiery_demand = st.number_input('Fiery Guacamole Per Day Demand', min_value=0, max_value=1000, value=7)
-    thai_monthly_demand = thai_demand * 30
-    kid_monthly_demand = kid_demand * 30
-    fiery_monthly_demand = fiery_demand * 30
-
-
-# Demand visualization
-st.markdown("<h2 style='text-align: center;'>Product Demand 📌</h2>", unsafe_allow_html=True)
-thai_monthly_demand = thai_demand * 30
-kid_monthly_demand = kid_demand * 30
-fiery_monthly_demand = fiery_demand * 30
-
-# Data
-monthly_demand_data = {
-    'Gucamole': ['Thai Guacamole', 'Kid Friendly Guacamole', 'Fiery Guacamole'],
-    'Monthly Demand': [thai_monthly_demand, kid_monthly_demand, fiery_monthly_demand]
-}
-
-# Create a DataFrame
-df = pd.DataFrame(monthly_demand_data)
-
-# Create a bar plot using Plotly
-fig = go.Figure()
-
-# Add bars to the figure
-fig.add_trace(go.Bar(
-    x=df['Gucamole'],
-    y=df['Monthly Demand'],
-    marker_color='green',
-    text=df['Monthly Demand'],
-    textposition='auto',
-    textfont=dict(size=18)
-))
-
-# Update layout
-fig.update_layout(
-    title='Monthly Demand of Guacamole',
-    xaxis_title='Guacamole',
-    yaxis_title='Monthly Demand',
-    template='plotly_white'  # Optional: change template for better visuals
-)
-
-# Display the figure in Streamlit
-st.plotly_chart(fig)
-
-# Add a divider
-st.divider()
-
-# Ingredients demand
-st.markdown("<h2 style='text-align: center;'>Ingredients Demand 📋</h2>", unsafe_allow_html=True)
-col1, col2, col3 = st.columns(3)
-
-# Demand for thai guacamole ingredients
-with col1:
-    daily_demand_avocado_thai = avocado_thai * thai_demand
-    daily_demand_lime_thai = lime_thai * thai_demand
-    daily_demand_red_chili_thai = red_chili_thai * thai_demand
-    daily_demand_onion_thai = onion_thai * thai_demand
-    daily_demand_coriander_thai = coriander_thai * thai_demand
-
-    # Data
-    monthly_demand_data = {
-        'Ingredient': ['Avocado', 'Lime', 'Red Chili', 'Onion', 'Coriander'],
-        'Daily Demand': [
-            daily_demand_avocado_thai,
-            daily_demand_lime_thai,
-            daily_demand_red_chili_thai,
-            daily_demand_onion_thai,
-            daily_demand_coriander_thai
-        ]
-    }
-
-    # Create a DataFrame
-    df_thai_ingredients = pd.DataFrame(monthly_demand_data)
-
-    # Calculate monthly demand (assuming 30 days)
-    df_thai_ingredients['Monthly Demand'] = df_thai_ingredients['Daily Demand'] * 30
-
-    # Create a bar plot using Plotly
-    fig = go.Figure()
-
-    # Add bars for daily demand
-    fig.add_trace(go.Bar(
-        x=df_thai_ingredients['Ingredient'],
-        y=df_thai_ingredients['Daily Demand'],
-        name='Daily Demand',
-        marker_color='green',
-        text=df_thai_ingredients['Daily Demand'],
-        textposition='auto',
-        textfont=dict(size=14)
-    ))
-
-    # Add bars for monthly demand
-    fig.add_trace(go.Bar(
-        x=df_thai_ingredients['Ingredient'],
-        y=df_thai_ingredients['Monthly Demand'],
-        name='Monthly Demand',
-        marker_color='blue',  # Change color for distinction
-        text=df_thai_ingredients['Monthly Demand'],
-        textposition='auto',
-        textfont=dict(size=14)
-    ))
-
-    # Update layout
-    fig.update_layout(
-        title='Daily and Monthly Demand of Thai Guacamole Ingredients',
-        xaxis_title='Ingredients',
-        yaxis_title='Demand',
-        barmode='group',  # Group bars together
-        template='plotly_white'  # Optional: change template for better visuals
-    )
-
-    # Display the figure in Streamlit
-    st.plotly_chart(fig)
-
-# Demand for kid friendly guacamole ingredients
-with col2:
-    daily_demand_avocado_kid = avocado_kid * kid_demand
-    daily_demand_lime_kid = lime_kid * kid_demand
-    daily_demand_mayonaise_kid = mayonnaise_kid * kid_demand
-    daily_demand_tomato_kid = tomato_kid * kid_demand
-    daily_demand_garlic_kid = garlic_kid * kid_demand
-
-    # Data
-    monthly_demand_data = {
-        'Ingredient': ['Avocado', 'Lime', 'Mayonnaise', 'Tomato', 'Garlic'],
-        'Daily Demand': [
-            daily_demand_avocado_kid,
-            daily_demand_lime_kid,
-            daily_demand_mayonaise_kid,
-            daily_demand_tomato_kid,
-            daily_demand_garlic_kid
-        ]
-    }
-
-    # Create a DataFrame
-    df_kid_ingredients = pd.DataFrame(monthly_demand_data)
-
-    # Calculate monthly demand (assuming 30 days)
-    df_kid_ingredients['Monthly Demand'] = df_kid_ingredients['Daily Demand'] * 30
-
-    # Create a bar plot using Plotly
-    fig = go.Figure()
-
-    # Add bars for daily demand
-    fig.add_trace(go.Bar(
-        x=df_kid_ingredients['Ingredient'],
-        y=df_kid_ingredients['Daily Demand'],
-        name='Daily Demand',
-        marker_color='green',
-        text=df_kid_ingredients['Daily Demand'],
-        textposition='auto',
-        textfont=dict(size=14)
-    ))
-
-    # Add bars for monthly demand
-    fig.add_trace(go.Bar(
-        x=df_kid_ingredients['Ingredient'],
-        y=df_kid_ingredients['Monthly Demand'],
-        name='Monthly Demand',
-        marker_color='blue',  # Change color for distinction
-        text=df_kid_ingredients['Monthly Demand'],
-        textposition='auto',
-        textfont=dict(size=14)
-    ))
-
-    # Update layout
-    fig.update_layout(
-        title='Daily and Monthly Demand of Kid Friendly Guacamole Ingredients',
-        xaxis_title='Ingredients',
-        yaxis_title='Demand',
-        barmode='group',  # Group bars together
-        template='plotly_white'  # Optional: change template for better visuals
-    )
-
-    # Display the figure in Streamlit
-    st.plotly_chart(fig)
-
-# Demand for fiery guacamole ingredients
-with col3:
-    daily_demand_avocado_fiery = avocado_fiery * fiery_demand
-    daily_demand_lime_fiery = lime_fiery * fiery_demand
-    daily_demand_jalapeno_chili_fiery = jalapeno_chili_fiery * fiery_demand
-    daily_demand_onion_fiery = onion_fiery * fiery_demand
-    daily_demand_tobasco_fiery = tobasco_fiery * fiery_demand
-
-    # Data
-    monthly_demand_data = {
-        'Ingredient': ['Avocado', 'Lime', 'Mayonnaise', 'Tomato', 'Garlic'],
-        'Daily Demand': [
-            daily_demand_avocado_fiery,
-            daily_demand_lime_fiery,
-            daily_demand_jalapeno_chili_fiery,
-            daily_demand_onion_fiery,
-            daily_demand_tobasco_fiery
-        ]
-    }
-
-    # Create a DataFrame
-    df_fiery_ingredients = pd.DataFrame(monthly_demand_data)
-
-    # Calculate monthly demand (assuming 30 days)
-    df_fiery_ingredients['Monthly Demand'] = df_fiery_ingredients['Daily Demand'] * 30
-
-    # Create a bar plot using Plotly
-    fig = go.Figure()
-
-    # Add bars for daily demand
-    fig.add_trace(go.Bar(
-        x=df_fiery_ingredients['Ingredient'],
-        y=df_fiery_ingredients['Daily Demand'],
-        name='Daily Demand',
-        marker_color='green',
-        text=df_fiery_ingredients['Daily Demand'],
-        textposition='auto',
-        textfont=dict(size=14)
-    ))
-
-    # Add bars for monthly demand
-    fig.add_trace(go.Bar(
-        x=df_fiery_ingredients['Ingredient'],
-        y=df_fiery_ingredients['Monthly Demand'],
-        name='Monthly Demand',
-        marker_color='blue',  # Change color for distinction
-        text=df_fiery_ingredients['Monthly Demand'],
-        textposition='auto',
-        textfont=dict(size=14)
-    ))
-
-    # Update layout
-    fig.update_layout(
-        title='Daily and Monthly Demand of Fiery Guacamole Ingredients',
-        xaxis_title='Ingredients',
-        yaxis_title='Demand',
-        barmode='group',  # Group bars together
-        template='plotly_white'  # Optional: change template for better visuals
-    )
+def recipe_columns(count, per_row=3):
+    # One column per recipe, wrapped into rows of three
+    columns = []
+    for start in range(0, count, per_row):
+        columns.extend(st.columns(per_row))
+    return columns[:count]
+
+# Wall time of every section of this run, and its memory while the profiling panel is shown
+timer = SectionTimer(memory=st.session_state.get('profiling', False))
+# An interrupted run, e.g. by a widget change, stops its memory tracing too
+try:
+    timer.start('Inputs')
+
+    # Recipe registry
+    book = load_recipes()
+
+    # Computation graph of the model, kept per session so a rerun only recomputes what its changed inputs affect
+    if 'model_graph' not in st.session_state:
+        st.session_state['model_graph'] = model_graph()
+    graph = st.session_state['model_graph']
+    graph.reset_stats()
+
+    # Page layout
+    st.set_page_config(layout="wide")
+
+    # Title
+    st.markdown("<h1 style='text-align: center;'>Break Even Analysis Holly Guacamole</h1>", unsafe_allow_html=True)
+
+    # Add a divider
+    st.divider()
+
+    # Enter recipe ingredients
+    st.sidebar.header("Guacamole Recipe Ingredients")
+    with st.sidebar.expander("Enter Guacamole Recipe Ingredients", expanded=False):
+        quantities = book.quantities.copy()
+        for r, name in enumerate(book.names):
+            st.markdown(f"<h4 style='text-align: center;'>{name}</h4>", unsafe_allow_html=True)
+            for i in book.ingredients(r):
+                product = book.products[i]
+                quantities[r, i] = st.number_input(f'{product} in {book.units[product]}', min_value=0.0, max_value=100.0,
+                                                   value=float(book.quantities[r, i]), key=f'quantity-{book.codes[r]}-{product}')
+
+    # Enter recipe ingredients
+    st.sidebar.header("Guacamole Per Day Demand")
+    with st.sidebar.expander("Enter Guacamole Per Day Demand", expanded=False):
+        # Enter recipe demand
+        daily_demand = np.array([
+            st.number_input(f'{name} Per Day Demand', min_value=0, max_value=1000, value=int(book.daily_demand[r]),
+                            key=f'demand-{book.codes[r]}')
+            for r, name in enumerate(book.names)
+        ], dtype=float)
+
+    # Enter selling prices
+    st.sidebar.header("Guacamole Selling Prices")
+    with st.sidebar.expander("Enter Guacamole Selling Prices", expanded=False):
+        selling_prices = np.array([
+            st.number_input(f'{name} Selling Price:', min_value=0.0, max_value=100.0, value=float(book.selling_prices[r]),
+                            key=f'selling-price-{book.codes[r]}')
+            for r, name in enumerate(book.names)
+        ])
+
+    # Date of the supplier prices, the latest offers unless a past date is chosen
+    st.sidebar.header("Supplier Prices")
+    with st.sidebar.expander("Enter Price Date", expanded=False):
+        # Offer history of the same source as the current prices, the offer store once one has been ingested
+        price_history = load_price_history(SUPPLIER_CSV_PATH)
+        price_date = None
+        if price_history.last_date is not None and st.toggle('Prices as of a past date', value=False):
+            # Dates before every ingredient has an offer would leave recipes without a cost
+            first_date = price_history.first_complete_date(book.products)
+            if first_date is None:
+                first_date = price_history.first_date
+            price_date = st.date_input('Price date', value=price_history.last_date.item(),
+                                       min_value=first_date.item(), max_value=price_history.last_date.item())
+
+    # Enter fixed costs
+    st.sidebar.header("Fixed Costs")
+    with st.sidebar.expander("Enter Fixed Costs", expanded=False):
+        rent = st.number_input('Rent:', min_value=0.0, max_value=MAX_FIXED_COST, value=1500.0)
+        salary = st.number_input('Salary:', min_value=0.0, max_value=MAX_FIXED_COST, value=1250.0)
+
+    # Enter inputs for variable costs
+    st.sidebar.header("Variable Costs")
+    with st.sidebar.expander("Enter Variable Costs", expanded=False):
+
+        # Direct variable costs
+        variable_salary = st.number_input('Variable Food Salary:', min_value=0.0, max_value=100.0, value=11.0)
+        variable_energy = st.number_input('Variable Food Energy Cost:', min_value=0.0, max_value=100.0, value=4.5)
+        variable_other = st.number_input('Variable Food Other Costs:', min_value=0.00, max_value=100.00, value=2.75)
+
+        # Cooking time of every recipe step
+        cooking_time = np.zeros(len(book))
+        for r, name in enumerate(book.names):
+            code = book.codes[r]
+            st.info(f'{code}: {name}', icon="ℹ️")
+            for s, step in enumerate(book.steps[r], start=1):
+                help_text = f"{code}: {name}. {step['description']}"
+                minutes = st.number_input(f'{code}{s} mins.:', min_value=0, max_value=100, value=step['minutes'], help=help_text)
+                seconds = st.number_input(f'{code}{s} sec.:', min_value=0, max_value=100, value=step['seconds'], help=help_text)
+                cooking_time[r] += minutes + (seconds / 60)
+
+    # Inputs of the model
+    graph.set('quantities', quantities)
+    graph.set('daily_demand', daily_demand)
+    graph.set('selling_prices', selling_prices)
+    graph.set('cooking_minutes', cooking_time)
+    graph.set('rates', [('Variable Food Salary', variable_salary), ('Variable Food Energy Cost', variable_energy),
+                        ('Variable Food Other Costs', variable_other)])
+    graph.set('rent', rent)
+    graph.set('salary', salary)
+
+    # Demand visualization
+    timer.start('Product Demand')
+    monthly_demand = graph.get('monthly_demand')
+    daily_ingredient_demand = graph.get('daily_ingredient_demand')
+
+    st.markdown("<h2 style='text-align: center;'>Product Demand 📌</h2>", unsafe_allow_html=True)
 
     # Display the figure in Streamlit
-    st.plotly_chart(fig)
-
-# Add a divider
-st.divider()
-
-# Ingredients costing
-st.markdown("<h2 style='text-align: center;'>Ingredients Costing ฿</h2>", unsafe_allow_html=True)
-col1, col2 = st.columns(2)
-
-# Supplier table
-with col1:
-    # Define the path to the CSV file
-    csv_file_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'supplier-ingredients.CSV')
-
-    # Read the CSV file into a pandas DataFrame, specifying the delimiter
-    df = pd.read_csv(csv_file_path, sep=';')
-
-    # Convert 'Product-ID' column to string and remove any commas
-    df['Product-ID'] = df['Product-ID'].astype(str).str.replace(',', '')
-
-    # Convert 'Quantity' column to integer by removing commas first and then casting to int
-    df['Quantity'] = df['Quantity'].astype(str).str.replace(',', '').astype(int)
-
-    # Display the DataFrame without commas in 'Quantity' using `st.dataframe` and formatting options
-    st.dataframe(df.style.format({"Quantity": "{:.0f}"}))
-
-# Min price of ingredients wrt to latest date
-with col2:
-    # Adjust the column name as per your actual DataFrame structure
-    ingredient_group = df.groupby('Product')
-
-    # Create a DataFrame to store the minimum price for the most recent date
-    min_price_recent_date = ingredient_group.apply(lambda x: x.loc[x['Date of Offer'].idxmax()]).reset_index(drop=True)
-
-    # Find the minimum price from the selected rows for each ingredient
-    result = min_price_recent_date.loc[min_price_recent_date.groupby('Product')['Price per Unit'].idxmin()]
-
-    # Store the price in variables
-    avocado_price = result.loc[result['Product'] == 'Avocado', 'Price per Unit'].values[0]
-    coriander_price = result.loc[result['Product'] == 'Coriander', 'Price per Unit'].values[0]
-    garlic_price = result.loc[result['Product'] == 'Garlic', 'Price per Unit'].values[0]
-    jalapeno_chili_price = result.loc[result['Product'] == 'Jalapeno Chili', 'Price per Unit'].values[0]
-    lime_price = result.loc[result['Product'] == 'Lime', 'Price per Unit'].values[0]
-    mayonnaise_price = result.loc[result['Product'] == 'Mayonnaise', 'Price per Unit'].values[0]
-    onion_price = result.loc[result['Product'] == 'Onion', 'Price per Unit'].values[0]
-    red_chili_price = result.loc[result['Product'] == 'Red Chili', 'Price per Unit'].values[0]
-    tabasco_price = result.loc[result['Product'] == 'Tabasco', 'Price per Unit'].values[0]
-    red_chili_price = result.loc[result['Product'] == 'Red Chili', 'Price per Unit'].values[0]
-    tomato_price = result.loc[result['Product'] == 'Tomato', 'Price per Unit'].values[0]
-
-    # Display the message using st.markdown
-    st.markdown(f"<h5 style='text-align: center; color: black;'>Price of Avocado 🥑: <span style='color: green;'>{avocado_price}</span></h5>", unsafe_allow_html=True)
-    st.markdown(f"<h5 style='text-align: center; color: black;'>Price of Coriander 🌱: <span style='color: green;'>{coriander_price}</span></h5>", unsafe_allow_html=True)
-    st.markdown(f"<h5 style='text-align: center; color: black;'>Price of Garlic 🧄: <span style='color: green;'>{garlic_price}</span></h5>", unsafe_allow_html=True)
-    st.markdown(f"<h5 style='text-align: center; color: black;'>Price of Jalapeno Chili 🫑: <span style='color: green;'>{jalapeno_chili_price}</span></h5>", unsafe_allow_html=True)
-    st.markdown(f"<h5 style='text-align: center; color: black;'>Price of Lime 🍋‍🟩: <span style='color: green;'>{lime_price}</span></h5>", unsafe_allow_html=True)
-    st.markdown(f"<h5 style='text-align: center; color: black;'>Price of Mayonnaise 🫙: <span style='color: green;'>{mayonnaise_price}</span></h5>", unsafe_allow_html=True)
-    st.markdown(f"<h5 style='text-align: center; color: black;'>Price of Onion 🧅: <span style='color: green;'>{onion_price}</span></h5>", unsafe_allow_html=True)
-    st.markdown(f"<h5 style='text-align: center; color: black;'>Price of Red Chili 🌶️: <span style='color: green;'>{red_chili_price}</span></h5>", unsafe_allow_html=True)
-    st.markdown(f"<h5 style='text-align: center; color: black;'>Price of Tabasco 🥫: <span style='color: green;'>{tabasco_price}</span></h5>", unsafe_allow_html=True)
-    st.markdown(f"<h5 style='text-align: center; color: black;'>Price of Tomato 🍅: <span style='color: green;'>{tomato_price}</span></h5>", unsafe_allow_html=True)
-
-# Cost of ingredients for producing Guacamole
-col1, col2, col3 = st.columns(3)
-
-# Cost of ingredients in Thai Guacamole
-with col1:
-    st.markdown("<h5 style='text-align: center;'>Cost of Ingredients for a Thai Guacamole</h5>", unsafe_allow_html=True)
-
-    avocado_thai_cost = display_ingredient_cost(avocado_thai, avocado_price, 'Avocado', 'Pcs.')
-    lime_thai_cost = display_ingredient_cost(lime_thai, lime_price, 'Lime', 'Pcs.')
-    red_chili_thai_cost = display_ingredient_cost(red_chili_thai, red_chili_price, 'Red Chili', 'Grams')
-    onion_thai_cost = display_ingredient_cost(onion_thai, onion_price, 'Onion', 'Grams')
-    coriander_thai_cost = display_ingredient_cost(coriander_thai, coriander_price, 'Coriander', 'Grams')
-    total_thai_guacamole_ingredient_cost = avocado_thai_cost + lime_thai_cost + red_chili_thai_cost + onion_thai_cost + coriander_thai_cost
-    total_thai_guacamole_ingredient_cost_formatted = f"{total_thai_guacamole_ingredient_cost:.2f}".replace('.', ',')
-    st.markdown(
-        f"<h6 style='text-align: left; color: black;'>Total cost of ingredients in Thai Guacamole: <span style='color: green;'>{total_thai_guacamole_ingredient_cost_formatted}</span></h6>",
-        unsafe_allow_html=True)
-
-# Cost of ingredients in Kid Friendly Guacamole
-with col2:
-    st.markdown("<h5 style='text-align: center;'>Cost of Ingredients for a Kid Friendly Guacamole</h5>", unsafe_allow_html=True)
-
-    avocado_kid_cost = display_ingredient_cost(avocado_kid, avocado_price, 'Avocado', 'Pcs.')
-    lime_kid_cost = display_ingredient_cost(lime_kid, lime_price, 'Lime', 'Pcs.')
-    mayonnaise_kid_cost = display_ingredient_cost(mayonnaise_kid, mayonnaise_price, 'Mayonnaise', 'ml')
-    tomato_kid_cost = display_ingredient_cost(tomato_kid, tomato_price, 'Tomato', 'Grams')
-    garlic_kid_cost = display_ingredient_cost(garlic_kid, garlic_price, 'Garlic', 'Grams')
-    total_kid_guacamole_ingredient_cost = avocado_kid_cost + lime_kid_cost + mayonnaise_kid_cost + tomato_kid_cost + garlic_kid_cost
-    total_kid_guacamole_ingredient_cost_formatted = f"{total_kid_guacamole_ingredient_cost:.2f}".replace('.', ',')
-    st.markdown(
-        f"<h6 style='text-align: left; color: black;'>Total cost of ingredients in Thai Guacamole: <span style='color: green;'>{total_kid_guacamole_ingredient_cost_formatted}</span></h6>",
-        unsafe_allow_html=True)
-
-# Cost of ingredients in Kid Friendly Guacamole
-with col3:
-    st.markdown("<h5 style='text-align: center;'>Cost of Ingredients for a Fiery Guacamole</h5>", unsafe_allow_html=True)
-
-    avocado_fiery_cost = display_ingredient_cost(avocado_fiery, avocado_price, 'Avocado', 'Pcs.')
-    lime_fiery_cost = display_ingredient_cost(lime_fiery, lime_price, 'Lime', 'Pcs.')
-    jalapeno_fiery_cost = display_ingredient_cost(jalapeno_chili_fiery, jalapeno_chili_price, 'Jalapenos', 'Grams')
-    onion_fiery_cost = display_ingredient_cost(onion_fiery, onion_price, 'Onion', 'Grams')
-    tobasco_fiery_cost = display_ingredient_cost(tobasco_fiery, tabasco_price, 'Tobasco', 'ml')
-    total_fiery_guacamole_ingredient_cost = avocado_fiery_cost + lime_fiery_cost + jalapeno_fiery_cost + onion_fiery_cost + tobasco_fiery_cost
-    total_fiery_guacamole_ingredient_cost_formatted = f"{total_fiery_guacamole_ingredient_cost:.2f}".replace('.', ',')
-    st.markdown(
-        f"<h6 style='text-align: left; color: black;'>Total cost of ingredients in Thai Guacamole: <span style='color: green;'>{total_fiery_guacamole_ingredient_cost_formatted}</span></h6>",
-        unsafe_allow_html=True)
-
-# Cost for producing guacamole
-thai_guacamole_monthly_ingredient_cost = round(total_thai_guacamole_ingredient_cost * thai_monthly_demand, 2)
-kid_guacamole_monthly_ingredient_cost = round(total_kid_guacamole_ingredient_cost * kid_monthly_demand, 2)
-fiery_guacamole_monthly_ingredient_cost = round(total_fiery_guacamole_ingredient_cost * fiery_monthly_demand, 2)
-data = [
-    {'Product': 'Thai Gucamole', 'Monthly Cost': thai_guacamole_monthly_ingredient_cost},
-    {'Product': 'Kid Friendly Gucamole', 'Monthly Cost': kid_guacamole_monthly_ingredient_cost},
-    {'Product': 'Fiery Gucamole', 'Monthly Cost': fiery_guacamole_monthly_ingredient_cost}
-]
-df_ingredient_cost = pd.DataFrame(data)
-
-# Chart
-total_monthly_ingredient_cost = df_ingredient_cost['Monthly Cost'].sum()
-total_data = pd.DataFrame({
-    'Product': ['Total Monthly Cost'],
-    'Monthly Cost': [total_monthly_ingredient_cost]
-})
-df_total = pd.concat([df_ingredient_cost, total_data], ignore_index=True)
-fig = px.bar(df_total, x='Product', y='Monthly Cost',
-             title='Monthly Guacamole Ingredients Cost',
-             labels={'Monthly Cost': 'Cost in EUR'},
-             color='Product',
-             text_auto='Monthly Cost')
-fig.update_layout(yaxis_title='Monthly Cost',
-                  xaxis_title='Products',
-                  xaxis_tickangle=-45)
-st.plotly_chart(fig)
-
-# Add a divider
-st.divider()
-
-# Enter selling prices
-st.sidebar.header("Guacamole Selling Prices")
-with st.sidebar.expander("Enter Guacamole Selling Prices", expanded=False):
-    selling_price_thai_guacamole = st.number_input('Thai Guacamole Selling Price:', min_value=0.0, max_value=100.0, value=11.0)
-    selling_price_kid_guacamole = st.number_input('Kid Friendly Guacamole Selling Price:', min_value=0.0, max_value=100.0, value=12.5)
-    selling_price_fiery_guacamole = st.number_input('Fiery Guacamole Selling Price:', min_value=0.0, max_value=100.0, value=12.0)
-
-# Per month revenue
-st.markdown("<h2 style='text-align: center;'>Guacamole Revenue ⛳️</h2>", unsafe_allow_html=True)
-monthly_revenue_thai_guacamole = round(selling_price_thai_guacamole * thai_monthly_demand, 2)
-monthly_revenue_kid_guacamole = round(selling_price_kid_guacamole * kid_monthly_demand, 2)
-monthly_revenue_fiery_guacamole = round(selling_price_fiery_guacamole * fiery_monthly_demand, 2)
-data = [
-    {'Product': 'Thai Gucamole', 'Monthly Revenue': monthly_revenue_thai_guacamole},
-    {'Product': 'Kid Friendly Gucamole', 'Monthly Revenue': monthly_revenue_kid_guacamole},
-    {'Product': 'Fiery Gucamole', 'Monthly Revenue': monthly_revenue_fiery_guacamole}
-]
-df = pd.DataFrame(data)
-
-# Chart
-total_monthly_revenue = df['Monthly Revenue'].sum()
-total_data = pd.DataFrame({
-    'Product': ['Total Monthly Revenue'],
-    'Monthly Revenue': [total_monthly_revenue]
-})
-df_total = pd.concat([df, total_data], ignore_index=True)
-fig = px.bar(df_total, x='Product', y='Monthly Revenue',
-             title='Monthly Guacamole Revenue',
-             labels={'Monthly Revenue'},
-             color='Product',
-             text_auto='Monthly Revenue')
-fig.update_layout(yaxis_title='Monthly Revenue',
-                  xaxis_title='Products',
-                  xaxis_tickangle=-45)
-st.plotly_chart(fig)
-
-# Add a divider
-st.divider()
-
-# Enter fixed costs
-st.sidebar.header("Fixed Costs")
-with st.sidebar.expander("Enter Fixed Costs", expanded=False):
-    rent = st.number_input('Rent:', min_value=0.0, max_value=20000.0, value=1500.0)
-    salary = st.number_input('Salary:', min_value=0.0, max_value=20000.0, value=1250.0)
-
-# Enter inputs for variable costs
-st.sidebar.header("Variable Costs")
-with st.sidebar.expander("Enter Variable Costs", expanded=False):
-
-    # Direct variable costs
-    variable_salary = st.number_input('Variable Food Salary:', min_value=0.0, max_value=100.0, value=11.0)
-    variable_energy = st.number_input('Variable Food Energy Cost:', min_value=0.0, max_value=100.0, value=4.5)
-    variable_other = st.number_input('Variable Food Other Costs:', min_value=0.00, max_value=100.00, value=2.75)
-
-    # For thai guacamole recipe
-    st.info('TG: Thai Guacamole', icon="ℹ️")
-    tg1 = st.number_input('TG1 mins.:', min_value=0, max_value=100, value=7,
-                          help='TG: Thai Guacamole. Place avocados and lime or lemon juice in a medium bowl and roughly mash with a fork. Season to taste.')
-    tg1s = st.number_input('TG1 sec.:', min_value=0, max_value=100, value=0,
-                          help='TG: Thai Guacamole. Place avocados and lime or lemon juice in a medium bowl and roughly mash with a fork. Season to taste.')
-    tg2 = st.number_input('TG2 mins.:', min_value=0, max_value=100, value=5,
-                          help='TG: Thai Guacamole. Stir through remaining ingredients, reserving some chilli, coriander and red onion to garnish.')
-    tg2s = st.number_input('TG2 sec.:', min_value=0, max_value=100, value=0,
-                          help='TG: Thai Guacamole. Stir through remaining ingredients, reserving some chilli, coriander and red onion to garnish.')
-
-    cooking_time_tg = tg1 + tg2 + (tg1s/60) + (tg2s/60)
-    monthly_cooking_time_tg = (cooking_time_tg * thai_monthly_demand) / 60
-    monthly_cooking_cost_tg = round(monthly_cooking_time_tg * (variable_salary + variable_energy + variable_other),2)
-
-    # For kid friendly guacamole
-    st.info('KFG: Kid Friendly Guacamole', icon="ℹ️")
-    kfg1 = st.number_input('KFG1 mins.:', min_value=0, max_value=100, value=7,
-                          help='KFG: Kid Friendly Guacamole. Place avocados and lime or lemon juice in a medium bowl and mash with a fork. Season to taste.')
-    kfg1s = st.number_input('KFG1 sec.:', min_value=0, max_value=100, value=25,
-                          help='KFG: Kid Friendly Guacamole. Place avocados and lime or lemon juice in a medium bowl and mash with a fork. Season to taste.')
-    kfg2 = st.number_input('KFG2 mins.:', min_value=0, max_value=100, value=5,
-                          help='KFG: Kid Friendly Guacamole. Add mayonnaise, garlic and 3/4 quarters of the tomato. Stir until combined.')
-    kfg2s = st.number_input('KFG2 sec.:', min_value=0, max_value=100, value=0,
-                          help='KFG: Kid Friendly Guacamole. Add mayonnaise, garlic and 3/4 quarters of the tomato. Stir until combined.')
-    kfg3 = st.number_input('KFG3 mins.:', min_value=0, max_value=100, value=3,
-                          help='KFG: Kid Friendly Guacamole. Garnish with reserved chopped tomato.')
-    kfg3s = st.number_input('KFG3 sec.:', min_value=0, max_value=100, value=0,
-                          help='KFG: Kid Friendly Guacamole. Garnish with reserved chopped tomato.')
-
-    cooking_time_kfg = kfg1 + kfg2 + kfg3 + (kfg1s / 60) + (kfg2s / 60) + (kfg3s/60)
-    monthly_cooking_time_kfg = (cooking_time_kfg * kid_monthly_demand) / 60
-    monthly_cooking_cost_kfg = round(monthly_cooking_time_kfg * (variable_salary + variable_energy + variable_other),2)
-
-    # For fiery guacamole
-    st.info('FG: Fiery Guacamole', icon="ℹ️")
-    fg1 = st.number_input('FG1 mins.:', min_value=0, max_value=100, value=7,
-                          help='FG: Fiery Guacamole. Place avocados and lime or lemon juice in a medium bowl and mash with a fork. Season to taste.')
-    fg1s = st.number_input('FG1 sec.:', min_value=0, max_value=100, value=0,
-                          help='FG: Fiery Guacamole. Place avocados and lime or lemon juice in a medium bowl and mash with a fork. Season to taste.')
-    fg2 = st.number_input('FG2 mins.:', min_value=0, max_value=100, value=3,
-                          help='FG: Fiery Guacamole. Stir through remaining ingredients, reserving some red onion for garnish.')
-    fg2s = st.number_input('FG2 sec.:', min_value=0, max_value=100, value=0,
-                          help='FG: Fiery Guacamole. Stir through remaining ingredients, reserving some red onion for garnish.')
-    fg3 = st.number_input('FG3 mins.:', min_value=0, max_value=100, value=5,
-                          help='FG: Fiery Guacamole. Garnish with extra jalapeno slices, reserved red onion and micro-herbs if desired.')
-    fg3s = st.number_input('FG3 sec.:', min_value=0, max_value=100, value=0,
-                          help='FG: Fiery Guacamole. Garnish with extra jalapeno slices, reserved red onion and micro-herbs if desired.')
-
-    cooking_time_fg = fg1 + fg2 + fg3 + (fg1s / 60) + (fg2s / 60) + (fg3s/60)
-    monthly_cooking_time_fg = (cooking_time_fg * fiery_monthly_demand) / 60
-    monthly_cooking_cost_fg = round(monthly_cooking_time_fg * (variable_salary + variable_energy + variable_other),2)
-
-# Financial analysis
-st.markdown("<h2 style='text-align: center;'>Financial Analysis 💶</h2>", unsafe_allow_html=True)
-
-# Calculations
-data = [
-    {'Category': 'Rent', 'Amount': rent},
-    {'Category': 'Salary', 'Amount': salary}
-]
-df = pd.DataFrame(data)
-
-total_fixed_cost = df['Amount'].sum()
-total_variable_cost = monthly_cooking_cost_fg + monthly_cooking_cost_kfg + monthly_cooking_cost_tg
-total_ingredients_cost = fiery_guacamole_monthly_ingredient_cost + kid_guacamole_monthly_ingredient_cost + thai_guacamole_monthly_ingredient_cost
-total_cost = total_variable_cost + total_fixed_cost + total_ingredients_cost
-profit = round(total_monthly_revenue - total_cost,2)
-
-# Display cost revenue and profit
-col1, col2, col3 = st.columns(3)
-col1.metric("Total Revenue", f"{total_monthly_revenue / 1000:.1f}k")
-col2.metric("Total Cost", f"{total_cost / 1000:.1f}k")
-col3.metric("Profit", f"{profit / 1000:.1f}k")
-
-# Chart for total cost revenue and profit
-data = [
-    {'Category': 'Total Revenue', 'Amount': total_monthly_revenue},
-    {'Category': 'Total Cost', 'Amount': total_cost},
-    {'Category': 'Profit', 'Amount': profit}
-]
-df = pd.DataFrame(data)
-# Create a single gauge chart with multiple labels and values
-fig = go.Figure(go.Indicator(
-    mode="gauge+number",
-    value=profit,
-    title={'text': "Profit"},
-    delta={'reference': total_cost, 'relative': False},
-    gauge={
-        'axis': {'range': [0, total_monthly_revenue]},
-        'bar': {'color': "green"},
-        'steps': [
-            {'range': [0, total_cost], 'color': "red"},
-            {'range': [total_cost, total_monthly_revenue], 'color': "yellow"}
-        ],
-        'threshold': {
-            'line': {'color': "blue", 'width': 4},
-            'thickness': 0.75,
-            'value': profit
-        }
-    }
-))
-
-# Add additional annotations for Total Revenue and Total Cost
-fig.add_trace(go.Indicator(
-    mode="number",
-    value=total_monthly_revenue,
-    title={'text': "Total Revenue"},
-    domain={'x': [0.1, 0.3], 'y': [0.1, 0.3]}
-))
-
-fig.add_trace(go.Indicator(
-    mode="number",
-    value=total_cost,
-    title={'text': "Total Cost"},
-    domain={'x': [0.7, 0.9], 'y': [0.1, 0.3]}
-))
-
-# Update layout for better visibility
-fig.update_layout(
-    margin=dict(l=50, r=50, t=50, b=50)
-)
-
-# Display the chart in Streamlit
-st.plotly_chart(fig)
-
-# Add a divier
-st.divider()
-
-# BE analysis
-st.markdown("<h2 style='text-align: center;'>Break Even Analysis 📈</h2>", unsafe_allow_html=True)
-
-# 3 cols for each product
-col1, col2, col3 = st.columns(3)
-
-# Calculate the variable cost per unit for tg
-with col1:
-    st.markdown("<h5 style='text-align: center;'>Thai Guacamole</h5>", unsafe_allow_html=True)
-    unit_vc_tg = round((total_variable_cost / 3) / thai_monthly_demand, 2)
-    st.metric(label='Avg. Unit Variable Cost', value=unit_vc_tg)
-    st.metric(label='Price', value=selling_price_thai_guacamole)
-    st.metric(label='Avg. Fixed Cost', value=round(total_fixed_cost/3,2))
-
-    # Create df
-    units = [0, 100, 200, 300, 400, 500, 600, 700, 800 ,900, 1000, 1100, 1200]
-    df_thai_be = pd.DataFrame({
-        'Units': units
+    st.plotly_chart(demand_figure(tuple(book.names), monthly_demand))
+
+    # Add a divider
+    st.divider()
+
+    # Ingredients demand
+    timer.start('Ingredients Demand')
+    st.markdown("<h2 style='text-align: center;'>Ingredients Demand 📋</h2>", unsafe_allow_html=True)
+
+    # One subplot per recipe
+    st.plotly_chart(ingredient_demand_figure(tuple(book.names), tuple(book.products), book.uses, daily_ingredient_demand,
+                                             DAYS_PER_MONTH))
+
+    # Demand of every ingredient over all recipes in the units of the supplier offers
+    supplier_offers, naive_offers = load_current_offers(SUPPLIER_CSV_PATH)
+    unit_factor = unit_factors(book.products, book.units, supplier_units(naive_offers))
+    ingredient_rollup = demand_rollup(book.products, book.units, quantities, daily_demand, unit_factor, DAYS_PER_MONTH)
+    mismatched_units = [product for product, factor in zip(book.products, unit_factor) if np.isnan(factor)]
+    if mismatched_units:
+        st.error(f"Recipe units of {', '.join(mismatched_units)} do not match their supplier unit.")
+
+    # Cheapest mix of supplier packs covering the monthly ingredient demand
+    purchase_plan = plan_purchases(supplier_offers, ingredient_rollup.set_index('Product')['Monthly'], naive_offers)
+    orders = order_sheet(ingredient_rollup, purchase_plan)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("<h3 style='text-align: center;'>Total Ingredient Demand</h3>", unsafe_allow_html=True)
+        st.dataframe(ingredient_rollup.style.format({'Daily': '{:,.1f}', 'Weekly': '{:,.1f}', 'Monthly': '{:,.1f}'}),
+                     hide_index=True)
+    with col2:
+        st.markdown("<h3 style='text-align: center;'>Order Sheet 🛒</h3>", unsafe_allow_html=True)
+        st.dataframe(orders, hide_index=True)
+        st.download_button('Download order sheet', orders.to_csv(index=False), file_name='order-sheet.csv', mime='text/csv')
+
+    # Add a divider
+    st.divider()
+
+    # Ingredients costing
+    timer.start('Ingredients Costing')
+
+    # Latest offer per product, cheapest one if several offers share that date, read from the
+    # materialized offer store when one has been ingested. The index is shared by all sessions.
+    if price_date is None:
+        price_snapshot = shared_price_index().snapshot()
+        prices = price_snapshot.prices
+        ingredient_prices = price_snapshot.vector(book.products)
+    else:
+        # Cheapest offer of the latest offer date on or before the chosen date
+        prices = price_history.prices(price_date)
+        ingredient_prices = price_history.vector(book.products, price_date)
+
+    # Cost of the ingredients of every recipe
+    graph.set('prices', ingredient_prices)
+    ingredient_costs = graph.get('ingredient_costs')
+    unit_ingredient_cost = graph.get('unit_cost')
+    monthly_ingredient_cost = graph.get('monthly_cost')
+
+    st.markdown("<h2 style='text-align: center;'>Ingredients Costing ฿</h2>", unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
+
+    # Supplier table
+    with col1:
+        # Typed supplier offers, parsed once and memory-mapped by every server process until the file changes
+        offers_table = shared_offers_table(SUPPLIER_CSV_PATH)
+
+        # Only the first rows are read from the mapped table, whatever the size of the file
+        df = offers_table.slice(0, SUPPLIER_TABLE_ROWS).to_pandas()
+
+        # Display the DataFrame without commas in 'Quantity' using `st.dataframe` and formatting options
+        st.dataframe(df.style.format({"Quantity": "{:.0f}", "Date of Offer": "{:%d.%m.%Y}"}, na_rep='-'))
+        if offers_table.num_rows > SUPPLIER_TABLE_ROWS:
+            st.caption(f"First {SUPPLIER_TABLE_ROWS:,} of {offers_table.num_rows:,} offers.")
+
+        # Report offers whose date could not be resolved, they are ignored for the latest price
+        unresolved = offers_table.column('Date of Offer').null_count
+        if unresolved:
+            st.warning(f"{unresolved} offers have an unresolvable Date of Offer and are ignored.")
+
+    # Min price of ingredients wrt to latest date
+    with col2:
+        # Ingredients without any supplier offer
+        missing_products = [product for product, price in zip(book.products, ingredient_prices) if np.isnan(price)]
+        if missing_products:
+            st.error(f"No supplier offer for {', '.join(missing_products)}.")
+
+        # Display the message using st.markdown
+        for product in sorted(prices):
+            st.markdown(f"<h5 style='text-align: center; color: black;'>Price of {product} {PRODUCT_EMOJIS.get(product, '')}: <span style='color: green;'>{format_price(prices[product])}</span></h5>", unsafe_allow_html=True)
+
+    # Cost of ingredients for producing Guacamole
+    for r, col in enumerate(recipe_columns(len(book))):
+        with col:
+            st.markdown(f"<h5 style='text-align: center;'>Cost of Ingredients for a {book.names[r]}</h5>", unsafe_allow_html=True)
+
+            for i in book.ingredients(r):
+                product = book.products[i]
+                display_ingredient_cost(quantities[r, i], ingredient_costs[r, i], product, book.units[product])
+            total_ingredient_cost_formatted = f"{unit_ingredient_cost[r]:.2f}".replace('.', ',')
+            st.markdown(
+                f"<h6 style='text-align: left; color: black;'>Total cost of ingredients in {book.names[r]}: <span style='color: green;'>{total_ingredient_cost_formatted}</span></h6>",
+                unsafe_allow_html=True)
+
+    # Cost for producing guacamole
+    df_ingredient_cost = pd.DataFrame({'Product': book.names, 'Monthly Cost': monthly_ingredient_cost})
+
+    # Chart
+    total_monthly_ingredient_cost = df_ingredient_cost['Monthly Cost'].sum()
+    total_data = pd.DataFrame({
+        'Product': ['Total Monthly Cost'],
+        'Monthly Cost': [total_monthly_ingredient_cost]
     })
-    df_thai_be['Price'] = selling_price_thai_guacamole
-    df_thai_be['VC per Unit'] = unit_vc_tg
-    df_thai_be['Total VC'] = df_thai_be['Units'] * df_thai_be['VC per Unit']
-    df_thai_be['Fixed Cost'] = round(total_fixed_cost/3,2)
-    df_thai_be['Total Cost'] = df_thai_be['Fixed Cost'] + df_thai_be['Total VC']
-    df_thai_be['Total Revenue'] = df_thai_be['Units'] * df_thai_be['Price']
-    df_thai_be['Profit/Loss'] = df_thai_be['Total Revenue'] - df_thai_be['Total Cost']
-    df_thai_be['BE Units'] = round(df_thai_be['Fixed Cost']/(df_thai_be['Price']-df_thai_be['VC per Unit']),0)
-
-    # Create chart
-    # Create traces using DataFrame
-    cost_trace = go.Scatter(
-        x=df_thai_be['Units'],
-        y=df_thai_be['Total Cost'],
-        mode='lines',
-        name='Total Cost',
-        line=dict(color='red')
-    )
-
-    revenue_trace = go.Scatter(
-        x=df_thai_be['Units'],
-        y=df_thai_be['Total Revenue'],
-        mode='lines',
-        name='Total Revenue',
-        line=dict(color='green')
-    )
-
-    # Break-even point
-    break_even_x = df_thai_be['BE Units'].mean()
-    break_even_y = df_thai_be['Total Cost'][df_thai_be['Units'].idxmax()]
-
-    # Create a layout
-    layout = go.Layout(
-        title='Break-even Analysis',
-        xaxis=dict(title='Units Sold'),
-        yaxis=dict(title='EUR'),
-        showlegend=True
-    )
-
-    # Create a figure
-    fig = go.Figure(data=[cost_trace, revenue_trace], layout=layout)
-
-    # Add break-even line
-    fig.add_trace(go.Scatter(
-        x=[break_even_x, break_even_x],
-        y=[0, break_even_y],
-        mode='lines',
-        name='Break-even line',
-        line=dict(color='blue', dash='dash')
-    ))
-
-    # Add break-even value annotation
-    fig.add_annotation(
-        x=break_even_x,
-        y=break_even_y,
-        text=f'{int(break_even_x)}',
-        showarrow=True,
-        arrowhead=2,
-        ax=0,
-        ay=-40,  # Adjust vertical position
-        font=dict(color='blue')
-    )
-
-    # Show plot in Streamlit app
-    st.plotly_chart(fig)
-
-# Calculate the variable cost per unit for kfg
-with col2:
-    st.markdown("<h5 style='text-align: center;'>Kid Friendly Guacamole</h5>", unsafe_allow_html=True)
-    unit_vc_kfg = round((total_variable_cost / 3) / kid_monthly_demand, 2)
-    st.metric(label='Avg. Unit Variable Cost', value=unit_vc_kfg)
-    st.metric(label='Price', value=selling_price_kid_guacamole)
-    st.metric(label='Avg. Fixed Cost', value=round(total_fixed_cost/3,2))
-
-    # Create df
-    units = [0, 100, 200, 300, 400, 500, 600, 700, 800 ,900, 1000, 1100, 1200]
-    df_thai_kfg = pd.DataFrame({
-        'Units': units
+    df_total = pd.concat([df_ingredient_cost, total_data], ignore_index=True)
+    st.plotly_chart(product_bar_figure(tuple(df_total['Product']), df_total['Monthly Cost'].to_numpy(), 'Monthly Cost',
+                                       'Monthly Guacamole Ingredients Cost'))
+
+    # Cost of the order sheet of the Ingredients Demand section
+    st.markdown("<h3 style='text-align: center;'>Purchase Plan 🛒</h3>", unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
+    col1.metric('Monthly Purchase Cost', f"{purchase_plan.costs['Cost'].sum():,.2f}")
+    col2.metric('Savings vs. Latest Cheapest Offer', f"{purchase_plan.costs['Savings'].sum():,.2f}")
+
+    # Add a divider
+    st.divider()
+
+    # Per month revenue
+    timer.start('Revenue')
+    st.markdown("<h2 style='text-align: center;'>Guacamole Revenue ⛳️</h2>", unsafe_allow_html=True)
+    monthly_revenue = graph.get('revenue')
+    df = pd.DataFrame({'Product': book.names, 'Monthly Revenue': monthly_revenue})
+
+    # Chart
+    total_monthly_revenue = graph.get('total_revenue')
+    total_data = pd.DataFrame({
+        'Product': ['Total Monthly Revenue'],
+        'Monthly Revenue': [total_monthly_revenue]
     })
-    df_thai_kfg['Price'] = selling_price_kid_guacamole
-    df_thai_kfg['VC per Unit'] = unit_vc_kfg
-    df_thai_kfg['Total VC'] = df_thai_kfg['Units'] * df_thai_kfg['VC per Unit']
-    df_thai_kfg['Fixed Cost'] = round(total_fixed_cost/3,2)
-    df_thai_kfg['Total Cost'] = df_thai_kfg['Fixed Cost'] + df_thai_kfg['Total VC']
-    df_thai_kfg['Total Revenue'] = df_thai_kfg['Units'] * df_thai_kfg['Price']
-    df_thai_kfg['Profit/Loss'] = df_thai_kfg['Total Revenue'] - df_thai_kfg['Total Cost']
-    df_thai_kfg['BE Units'] = round(df_thai_kfg['Fixed Cost']/(df_thai_kfg['Price']-df_thai_kfg['VC per Unit']),0)
-
-    # Create chart
-    # Create traces using DataFrame
-    cost_trace = go.Scatter(
-        x=df_thai_kfg['Units'],
-        y=df_thai_kfg['Total Cost'],
-        mode='lines',
-        name='Total Cost',
-        line=dict(color='red')
-    )
-
-    revenue_trace = go.Scatter(
-        x=df_thai_kfg['Units'],
-        y=df_thai_kfg['Total Revenue'],
-        mode='lines',
-        name='Total Revenue',
-        line=dict(color='green')
-    )
-
-    # Break-even point
-    break_even_x = df_thai_kfg['BE Units'].mean()
-    break_even_y = df_thai_kfg['Total Cost'][df_thai_kfg['Units'].idxmax()]
-
-    # Create a layout
-    layout = go.Layout(
-        title='Break-even Analysis',
-        xaxis=dict(title='Units Sold'),
-        yaxis=dict(title='EUR'),
-        showlegend=True
-    )
-
-    # Create a figure
-    fig = go.Figure(data=[cost_trace, revenue_trace], layout=layout)
-
-    # Add break-even line
-    fig.add_trace(go.Scatter(
-        x=[break_even_x, break_even_x],
-        y=[0, break_even_y],
-        mode='lines',
-        name='Break-even line',
-        line=dict(color='blue', dash='dash')
-    ))
-
-    # Add break-even value annotation
-    fig.add_annotation(
-        x=break_even_x,
-        y=break_even_y,
-        text=f'{int(break_even_x)}',
-        showarrow=True,
-        arrowhead=2,
-        ax=0,
-        ay=-40,  # Adjust vertical position
-        font=dict(color='blue')
-    )
-
-    # Show plot in Streamlit app
-    st.plotly_chart(fig)
-
-# Calculate the variable cost per unit for fg
-with col3:
-    st.markdown("<h5 style='text-align: center;'>Fiery Guacamole</h5>", unsafe_allow_html=True)
-    unit_vc_fg = round((total_variable_cost / 3) / fiery_monthly_demand, 2)
-    st.metric(label='Avg. Unit Variable Cost', value=unit_vc_fg)
-    st.metric(label='Price', value=selling_price_fiery_guacamole)
-    st.metric(label='Avg. Fixed Cost', value=round(total_fixed_cost/3,2))
-
-    # Create df
-    units = [0, 100, 200, 300, 400, 500, 600, 700, 800 ,900, 1000, 1100, 1200]
-    df_thai_fg = pd.DataFrame({
-        'Units': units
-    })
-    df_thai_fg['Price'] = selling_price_fiery_guacamole
-    df_thai_fg['VC per Unit'] = unit_vc_fg
-    df_thai_fg['Total VC'] = df_thai_fg['Units'] * df_thai_fg['VC per Unit']
-    df_thai_fg['Fixed Cost'] = round(total_fixed_cost/3,2)
-    df_thai_fg['Total Cost'] = df_thai_fg['Fixed Cost'] + df_thai_fg['Total VC']
-    df_thai_fg['Total Revenue'] = df_thai_fg['Units'] * df_thai_fg['Price']
-    df_thai_fg['Profit/Loss'] = df_thai_fg['Total Revenue'] - df_thai_fg['Total Cost']
-    df_thai_fg['BE Units'] = round(df_thai_fg['Fixed Cost']/(df_thai_fg['Price']-df_thai_fg['VC per Unit']),0)
-
-    # Create chart
-    # Create traces using DataFrame
-    cost_trace = go.Scatter(
-        x=df_thai_fg['Units'],
-        y=df_thai_fg['Total Cost'],
-        mode='lines',
-        name='Total Cost',
-        line=dict(color='red')
-    )
-
-    revenue_trace = go.Scatter(
-        x=df_thai_fg['Units'],
-        y=df_thai_fg['Total Revenue'],
-        mode='lines',
-        name='Total Revenue',
-        line=dict(color='green')
-    )
-
-    # Break-even point
-    break_even_x = df_thai_fg['BE Units'].mean()
-    break_even_y = df_thai_fg['Total Cost'][df_thai_fg['Units'].idxmax()]
-
-    # Create a layout
-    layout = go.Layout(
-        title='Break-even Analysis',
-        xaxis=dict(title='Units Sold'),
-        yaxis=dict(title='EUR'),
-        showlegend=True
-    )
-
-    # Create a figure
-    fig = go.Figure(data=[cost_trace, revenue_trace], layout=layout)
-
-    # Add break-even line
-    fig.add_trace(go.Scatter(
-        x=[break_even_x, break_even_x],
-        y=[0, break_even_y],
-        mode='lines',
-        name='Break-even line',
-        line=dict(color='blue', dash='dash')
-    ))
-
-    # Add break-even value annotation
-    fig.add_annotation(
-        x=break_even_x,
-        y=break_even_y,
-        text=f'{int(break_even_x)}',
-        showarrow=True,
-        arrowhead=2,
-        ax=0,
-        ay=-40,  # Adjust vertical position
-        font=dict(color='blue')
-    )
-
-    # Show plot in Streamlit app
-    st.plotly_chart(fig)
-
-# Add a divier
-st.divider()
-
-# Calculation flow
-st.markdown("<h2 style='text-align: center;'>Calculation Flow</h2>", unsafe_allow_html=True)
-graph = graphviz.Digraph()
-
-# Revenue
-with graph.subgraph(name = 'Revenue'):
-    graph.node('TG Monthly Revenue', label=f'TG Monthly Revenue: {monthly_revenue_thai_guacamole}', shape='ellipse', style='filled',
-               fillcolor='green')
-    graph.node('KFG Monthly Revenue', label=f'KFG Monthly Revenue: {monthly_revenue_kid_guacamole}', shape='ellipse', style='filled',
-               fillcolor='green')
-    graph.node('FG Monthly Revenue', label=f'FG Monthly Revenue: {monthly_revenue_fiery_guacamole}', shape='ellipse', style='filled',
-               fillcolor='green')
-    graph.node('Total Revenue', label=f'Total Revenue: {total_monthly_revenue}', shape='ellipse', style='filled',
-               fillcolor='green')
-
-    graph.edge('Selling Price TG', 'TG Monthly Revenue', label=str(selling_price_thai_guacamole), color='green')
-    graph.edge('Monthly Demand TG', 'TG Monthly Revenue', label=str(thai_monthly_demand), color='green')
-    graph.edge('Selling Price KFG', 'KFG Monthly Revenue', label=str(selling_price_kid_guacamole), color='green')
-    graph.edge('Monthly Demand KFG', 'KFG Monthly Revenue', label=str(kid_monthly_demand), color='green')
-    graph.edge('Selling Price FG', 'FG Monthly Revenue', label=str(selling_price_fiery_guacamole), color='green')
-    graph.edge('Monthly Demand FG', 'FG Monthly Revenue', label=str(fiery_monthly_demand), color='green')
-    graph.edge('TG Monthly Revenue', 'Total Revenue', label=str(monthly_revenue_thai_guacamole), color='green')
-    graph.edge('KFG Monthly Revenue', 'Total Revenue', label=str(monthly_revenue_kid_guacamole), color='green')
-    graph.edge('FG Monthly Revenue', 'Total Revenue', label=str(monthly_revenue_fiery_guacamole), color='green')
-
-# TG Ingredients Cost
-with graph.subgraph(name = 'TG Ingredients Cost'):
-    graph.node('TG Monthly Ingredients Cost', label=f'TG Monthly Ingredients Cost: {thai_guacamole_monthly_ingredient_cost}', shape='ellipse', style='filled',
-               fillcolor='lightcoral')
-
-    graph.edge('Avocado', 'TG Monthly Ingredients Cost', label=str(round(avocado_thai_cost * thai_monthly_demand, 2)), color='lightcoral')
-    graph.edge('Lime', 'TG Monthly Ingredients Cost', label=str(round(lime_thai_cost * thai_monthly_demand, 2)), color='lightcoral')
-    graph.edge('Red Chilli', 'TG Monthly Ingredients Cost', label=str(round(red_chili_thai_cost * thai_monthly_demand, 2)), color='lightcoral')
-    graph.edge('Onion', 'TG Monthly Ingredients Cost', label=str(round(onion_thai_cost * thai_monthly_demand, 2)), color='lightcoral')
-    graph.edge('Coriander', 'TG Monthly Ingredients Cost', label=str(round(coriander_thai_cost * thai_monthly_demand, 2)), color='lightcoral')
-
-# KFG Ingredients Cost
-with graph.subgraph(name = 'KFG Ingredients Cost'):
-    graph.node('KFG Monthly Ingredients Cost', label=f'KFG Monthly Ingredients Cost: {kid_guacamole_monthly_ingredient_cost}', shape='ellipse', style='filled',
-               fillcolor='lightcoral')
-
-    graph.edge('Avocado', 'KFG Monthly Ingredients Cost', label=str(round(avocado_kid_cost * kid_monthly_demand, 2)), color='lightcoral')
-    graph.edge('Lime', 'KFG Monthly Ingredients Cost', label=str(round(lime_kid_cost * kid_monthly_demand, 2)), color='lightcoral')
-    graph.edge('Mayonnaise', 'KFG Monthly Ingredients Cost', label=str(round(mayonnaise_kid_cost * kid_monthly_demand, 2)), color='lightcoral')
-    graph.edge('Tomato', 'KFG Monthly Ingredients Cost', label=str(round(tomato_kid_cost * kid_monthly_demand, 2)), color='lightcoral')
-    graph.edge('Garlic', 'KFG Monthly Ingredients Cost', label=str(round(garlic_kid_cost * kid_monthly_demand, 2)), color='lightcoral')
-
-# FG Ingredients Cost
-with graph.subgraph(name = 'FG Ingredients Cost'):
-    graph.node('FG Monthly Ingredients Cost', label=f'FG Monthly Ingredients Cost: {fiery_guacamole_monthly_ingredient_cost}', shape='ellipse', style='filled', fillcolor='lightcoral')
-
-    graph.edge('Avocado', 'FG Monthly Ingredients Cost', label=str(round(avocado_fiery_cost * fiery_monthly_demand, 2)), color='lightcoral')
-    graph.edge('Lime', 'FG Monthly Ingredients Cost', label=str(round(lime_fiery_cost * fiery_monthly_demand, 2)), color='lightcoral')
-    graph.edge('Jalapenos', 'FG Monthly Ingredients Cost', label=str(round(jalapeno_fiery_cost * fiery_monthly_demand, 2)), color='lightcoral')
-    graph.edge('Onion', 'FG Monthly Ingredients Cost', label=str(round(onion_fiery_cost * fiery_monthly_demand, 2)), color='lightcoral')
-    graph.edge('Tobasco', 'FG Monthly Ingredients Cost', label=str(round(tobasco_fiery_cost * fiery_monthly_demand, 2)), color='lightcoral')
-
-# Total Monthly Ingredients Cost
-with graph.subgraph(name = 'Total Monthly Ingredients Cost'):
-    graph.node('Total Monthly Ingredients Cost', label=f'Total Monthly Ingredients Cost: {total_ingredients_cost}', shape='ellipse', style='filled',
-               fillcolor='lightcoral')
-
-    graph.edge('TG Monthly Ingredients Cost', 'Total Monthly Ingredients Cost', label=str(round(thai_guacamole_monthly_ingredient_cost, 2)),
-               color='lightcoral')
-    graph.edge('KFG Monthly Ingredients Cost', 'Total Monthly Ingredients Cost', label=str(round(kid_guacamole_monthly_ingredient_cost, 2)),
-               color='lightcoral')
-    graph.edge('FG Monthly Ingredients Cost', 'Total Monthly Ingredients Cost', label=str(round(fiery_guacamole_monthly_ingredient_cost, 2)),
-               color='lightcoral')
-
-# Fixed Cost
-with graph.subgraph(name = 'Fixed Cost'):
-    graph.node('Fixed Cost', label=f'Fixed Cost: {total_fixed_cost}', shape='ellipse', style='filled', fillcolor='lightcoral')
-
-    graph.edge('Rent', 'Fixed Cost', label=str(rent), color='lightcoral')
-    graph.edge('Salary', 'Fixed Cost', label=str(salary), color='lightcoral')
-
-# Variable Cost
-with graph.subgraph(name = 'Variable Cost'):
-    total_monthly_cooking_time = round(monthly_cooking_time_tg + monthly_cooking_time_kfg + monthly_cooking_time_fg, 2)
-    total_monthly_cooking_cost = round(monthly_cooking_cost_tg + monthly_cooking_cost_kfg + monthly_cooking_cost_fg, 2)
-
-    graph.node('Total Monthly Variable Cost', label=f'Total Monthly Variable Cost: {total_monthly_cooking_cost}', shape='ellipse', style='filled',
-               fillcolor='lightcoral')
-    graph.node('TG Monthly Cooking Cost', label=f'TG Monthly Cooking Cost: {monthly_cooking_cost_tg}', shape='ellipse', style='filled',
-               fillcolor='lightcoral')
-    graph.node('KFG Monthly Cooking Cost', label=f'KFG Monthly Cooking Cost: {monthly_cooking_cost_kfg}', shape='ellipse', style='filled',
-               fillcolor='lightcoral')
-    graph.node('FG Monthly Cooking Cost', label=f'FG Monthly Cooking Cost: {monthly_cooking_cost_fg}', shape='ellipse', style='filled',
-               fillcolor='lightcoral')
-
-    graph.edge('TG Monthly Cooking Time', 'TG Monthly Cooking Cost', label=str(round(monthly_cooking_time_tg, 2)),
-               color='gray')
-    graph.edge('KFG Monthly Cooking Time', 'KFG Monthly Cooking Cost', label=str(round(monthly_cooking_time_kfg, 2)),
-               color='gray')
-    graph.edge('FG Monthly Cooking Time', 'FG Monthly Cooking Cost', label=str(round(monthly_cooking_time_fg, 2)),
-               color='gray')
-    graph.edge('Variable Food Salary', 'TG Monthly Cooking Cost', label=str(round(variable_salary, 2)),
-               color='lightcoral')
-    graph.edge('Variable Food Salary', 'KFG Monthly Cooking Cost', label=str(round(variable_salary, 2)),
-               color='lightcoral')
-    graph.edge('Variable Food Salary', 'FG Monthly Cooking Cost', label=str(round(variable_salary, 2)),
-               color='lightcoral')
-    graph.edge('Variable Food Energy Cost', 'TG Monthly Cooking Cost', label=str(round(variable_energy, 2)),
-               color='lightcoral')
-    graph.edge('Variable Food Energy Cost', 'KFG Monthly Cooking Cost', label=str(round(variable_energy, 2)),
-               color='lightcoral')
-    graph.edge('Variable Food Energy Cost', 'FG Monthly Cooking Cost', label=str(round(variable_energy, 2)),
-               color='lightcoral')
-    graph.edge('Variable Food Other Costs', 'TG Monthly Cooking Cost', label=str(round(variable_other, 2)),
-               color='lightcoral')
-    graph.edge('Variable Food Other Costs', 'KFG Monthly Cooking Cost', label=str(round(variable_other, 2)),
-               color='lightcoral')
-    graph.edge('Variable Food Other Costs', 'FG Monthly Cooking Cost', label=str(round(variable_other, 2)),
-               color='lightcoral')
-    graph.edge('TG Monthly Cooking Cost', 'Total Monthly Variable Cost', label=str(round(monthly_cooking_cost_tg, 2)),
-               color='lightcoral')
-    graph.edge('KFG Monthly Cooking Cost', 'Total Monthly Variable Cost', label=str(round(monthly_cooking_cost_kfg, 2)),
-               color='lightcoral')
-    graph.edge('FG Monthly Cooking Cost', 'Total Monthly Variable Cost', label=str(round(monthly_cooking_cost_fg, 2)),
-               color='lightcoral')
-
-# Total Cost
-with graph.subgraph(name = 'Total Cost'):
-    graph.node('Total Monthly Cost', label=f'Total Monthly Cost: {total_cost}', shape='ellipse', style='filled',
-               fillcolor='lightcoral')
-
-    graph.edge('Fixed Cost', 'Total Monthly Cost', label=str(round(total_fixed_cost, 2)),
-               color='lightcoral')
-    graph.edge('Total Monthly Variable Cost', 'Total Monthly Cost', label=str(round(total_variable_cost, 2)),
-               color='lightcoral')
-    graph.edge('Total Monthly Ingredients Cost', 'Total Monthly Cost', label=str(round(total_ingredients_cost, 2)),
-               color='lightcoral')
-
-# Profit
-with graph.subgraph(name = 'Profit'):
-    graph.node('Profit', label=f'Profit: {profit}', shape='ellipse', style='filled',
-               fillcolor='orange')
-
-    graph.edge('Total Revenue', 'Profit', label=str(round(total_monthly_revenue, 2)),
-               color='green')
-    graph.edge('Total Monthly Cost', 'Profit', label=f'-{total_cost}',
-               color='lightcoral')
-
-# TG BE
-with graph.subgraph(name = 'TG BE'):
-    be_tg_units = round(df_thai_be['BE Units'].mean(), 0)
-    tg_avg_vc = round(total_variable_cost/3/thai_monthly_demand, 2)
-    tg_avg_fc = round(total_fixed_cost/3, 2)
-
-    graph.node('TG BE Units', label=f'TG BE Units: {be_tg_units}', shape='ellipse', style='filled',
-               fillcolor='lightblue')
-    graph.node('Avg. TG Unit Variable Cost', label=f'Avg. TG Unit Variable Cost: {tg_avg_vc}', shape='ellipse', style='filled',
-               fillcolor='lightblue')
-    graph.node('Avg. TG Fixed Cost', label=f'Avg. TG Fixed Cost: {tg_avg_fc}', shape='ellipse', style='filled',
-               fillcolor='lightblue')
-
-    graph.edge('Total Monthly Variable Cost', 'Avg. TG Unit Variable Cost', color='lightblue')
-    graph.edge('Monthly Demand TG', 'Avg. TG Unit Variable Cost', color='lightblue')
-    graph.edge('Fixed Cost', 'Avg. TG Fixed Cost', color='lightblue')
-    graph.edge('Avg. TG Fixed Cost', 'TG BE Units', label=str(round(tg_avg_fc, 2)),
-               color='lightblue')
-    graph.edge('Avg. TG Unit Variable Cost', 'TG BE Units', label=str(round(tg_avg_vc, 2)),
-               color='lightblue')
-    graph.edge('Selling Price TG', 'TG BE Units', label=str(round(selling_price_thai_guacamole, 2)),
-               color='lightblue')
-
-# kFG BE
-with graph.subgraph(name = 'KFG BE'):
-    be_kfg_units = round(df_thai_kfg['BE Units'].mean(), 0)
-    kfg_avg_vc = round(total_variable_cost/3/kid_monthly_demand, 2)
-    kfg_avg_fc = round(total_fixed_cost/3, 2)
-
-    graph.node('KFG BE Units', label=f'KFG BE Units: {be_kfg_units}', shape='ellipse', style='filled',
-               fillcolor='lightblue')
-    graph.node('Avg. KFG Unit Variable Cost', label=f'Avg. KFG Unit Variable Cost: {kfg_avg_vc}', shape='ellipse', style='filled',
-               fillcolor='lightblue')
-    graph.node('Avg. KFG Fixed Cost', label=f'Avg. KFG Fixed Cost: {kfg_avg_fc}', shape='ellipse', style='filled',
-               fillcolor='lightblue')
-
-    graph.edge('Total Monthly Variable Cost', 'Avg. KFG Unit Variable Cost', color='lightblue')
-    graph.edge('Monthly Demand KFG', 'Avg. KFG Unit Variable Cost', color='lightblue')
-    graph.edge('Fixed Cost', 'Avg. KFG Fixed Cost', color='lightblue')
-    graph.edge('Avg. KFG Fixed Cost', 'KFG BE Units', label=str(round(kfg_avg_fc, 2)),
-               color='lightblue')
-    graph.edge('Avg. KFG Unit Variable Cost', 'KFG BE Units', label=str(round(kfg_avg_vc, 2)),
-               color='lightblue')
-    graph.edge('Selling Price KFG', 'KFG BE Units', label=str(round(selling_price_kid_guacamole, 2)),
-               color='lightblue')
-
-# FG BE
-with graph.subgraph(name = 'FG BE'):
-    be_fg_units = round(df_thai_fg['BE Units'].mean(), 0)
-    fg_avg_vc = round(total_variable_cost/3/fiery_monthly_demand, 2)
-    fg_avg_fc = round(total_fixed_cost/3, 2)
-
-    graph.node('FG BE Units', label=f'FG BE Units: {be_fg_units}', shape='ellipse', style='filled',
-               fillcolor='lightblue')
-    graph.node('Avg. FG Unit Variable Cost', label=f'Avg. FG Unit Variable Cost: {fg_avg_vc}', shape='ellipse', style='filled',
-               fillcolor='lightblue')
-    graph.node('Avg. FG Fixed Cost', label=f'Avg. FG Fixed Cost: {fg_avg_fc}', shape='ellipse', style='filled',
-               fillcolor='lightblue')
-
-    graph.edge('Total Monthly Variable Cost', 'Avg. FG Unit Variable Cost', color='lightblue')
-    graph.edge('Monthly Demand FG', 'Avg. FG Unit Variable Cost', color='lightblue')
-    graph.edge('Fixed Cost', 'Avg. FG Fixed Cost', color='lightblue')
-    graph.edge('Avg. FG Fixed Cost', 'FG BE Units', label=str(round(fg_avg_fc, 2)),
-               color='lightblue')
-    graph.edge('Avg. FG Unit Variable Cost', 'FG BE Units', label=str(round(fg_avg_vc, 2)),
-               color='lightblue')
-    graph.edge('Selling Price FG', 'FG BE Units', label=str(round(selling_price_fiery_guacamole, 2)),
-               color='lightblue')
-
-# Display the graph
-graph.attr(rankdir='LR')  # Change layout direction to left-to-right
-st.graphviz_chart(graph)
\ No newline at end of file
+    df_total = pd.concat([df, total_data], ignore_index=True)
+    st.plotly_chart(product_bar_figure(tuple(df_total['Product']), df_total['Monthly Revenue'].to_numpy(), 'Monthly Revenue',
+                                       'Monthly Guacamole Revenue'))
+
+    # Add a divider
+    st.divider()
+
+    # Financial analysis
+    timer.start('Financial Analysis')
+    st.markdown("<h2 style='text-align: center;'>Financial Analysis 💶</h2>", unsafe_allow_html=True)
+    hourly_rate = graph.get('hourly_rate')
+
+    # Calculations
+    total_fixed_cost = graph.get('total_fixed_cost')
+    total_variable_cost = graph.get('total_variable_cost')
+    total_cost = graph.get('total_cost')
+    profit = graph.get('profit')
+
+    # Display cost revenue and profit
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total Revenue", f"{total_monthly_revenue / 1000:.1f}k")
+    col2.metric("Total Cost", f"{total_cost / 1000:.1f}k")
+    col3.metric("Profit", f"{profit / 1000:.1f}k")
+
+    # Chart for total cost revenue and profit
+    st.plotly_chart(profit_gauge_figure(total_monthly_revenue, total_cost, profit))
+
+    # Add a divier
+    st.divider()
+
+    # BE analysis
+    timer.start('Break Even Analysis')
+    st.markdown("<h2 style='text-align: center;'>Break Even Analysis 📈</h2>", unsafe_allow_html=True)
+
+    # Full variable cost per unit (ingredients and cooking) and the fixed cost split evenly across the
+    # recipes, break-even of every product and the break-even of the whole menu at the current sales mix
+    unit_vc = graph.get('unit_vc')
+    avg_fixed_cost = graph.get('avg_fixed_cost')
+    be_units = graph.get('be_units')
+    be_total_units = graph.get('be_total_units')
+    be_mix_units = graph.get('be_mix_units')
+    be_line_units, be_line_cost, be_line_revenue = graph.get('be_lines')
+
+    if np.isfinite(be_total_units):
+        st.markdown(
+            f"<h5 style='text-align: center;'>Sales Mix Break-even: {be_total_units:,.0f} units per month "
+            f"({', '.join(f'{code} {units:,.0f}' for code, units in zip(book.codes, be_mix_units))})</h5>",
+            unsafe_allow_html=True)
+    else:
+        st.markdown("<h5 style='text-align: center;'>Sales Mix Break-even: not reachable at the current prices</h5>", unsafe_allow_html=True)
+
+    # One col for each product
+    for r, col in enumerate(recipe_columns(len(book))):
+        with col:
+            st.markdown(f"<h5 style='text-align: center;'>{book.names[r]}</h5>", unsafe_allow_html=True)
+            st.metric(label='Avg. Unit Variable Cost', value=unit_vc[r])
+            st.metric(label='Price', value=selling_prices[r])
+            st.metric(label='Avg. Fixed Cost', value=avg_fixed_cost)
+
+    # Cost and revenue lines of every product in one figure, straight lines only need their end points
+    st.plotly_chart(break_even_figure(tuple(book.names), be_line_units, be_line_cost, be_line_revenue, be_units, unit_vc,
+                                      avg_fixed_cost))
+
+    # Add a divier
+    st.divider()
+
+    # Scenario sweep
+    timer.start('Scenario Sweep')
+    st.markdown("<h2 style='text-align: center;'>Scenario Sweep 🔀</h2>", unsafe_allow_html=True)
+    if st.toggle('Evaluate scenario grid', value=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            price_range = st.slider('Selling price in % of current', min_value=10, max_value=300, value=(50, 150))
+            demand_range = st.slider('Demand in % of current', min_value=10, max_value=300, value=(50, 150))
+        with col2:
+            sweep_product = st.selectbox('Ingredient price to vary', book.products, index=0)
+            sweep_column = book.products.index(sweep_product)
+            current_price = float(np.nan_to_num(ingredient_prices[sweep_column]))
+            ingredient_range = st.slider(f'{sweep_product} price', min_value=0.0, max_value=max(current_price * 3, 1.0),
+                                         value=(current_price * 0.5, current_price * 1.5))
+        with col3:
+            rent_range = st.slider('Rent', min_value=0.0, max_value=MAX_FIXED_COST, value=(0.0, min(2 * rent, MAX_FIXED_COST)))
+            grid_size = st.slider('Grid points per parameter', min_value=2, max_value=41, value=21)
+
+        # Evaluate every combination of the grids at once
+        scenarios = sweep(quantities, ingredient_prices, daily_demand, selling_prices, cooking_time,
+                          hourly_rate, salary,
+                          np.linspace(*price_range, grid_size) / 100, np.linspace(*demand_range, grid_size) / 100,
+                          sweep_column, np.linspace(*ingredient_range, grid_size), np.linspace(*rent_range, grid_size))
+        st.caption(f"{scenarios.profit.size:,} scenarios evaluated.")
+
+        # Slice of the grid shown in the heatmaps
+        col1, col2 = st.columns(2)
+        with col1:
+            sweep_ingredient_price = st.select_slider(f'{sweep_product} price in heatmaps', options=np.round(scenarios.ingredient_prices, 4),
+                                                      value=np.round(scenarios.ingredient_prices, 4)[grid_size // 2])
+        with col2:
+            sweep_rent = st.select_slider('Rent in heatmaps', options=np.round(scenarios.rents, 2),
+                                          value=np.round(scenarios.rents, 2)[grid_size // 2])
+        a = int(np.argmin(np.abs(scenarios.ingredient_prices - sweep_ingredient_price)))
+        k = int(np.argmin(np.abs(scenarios.rents - sweep_rent)))
+
+        col1, col2 = st.columns(2)
+        for col, values, title in [(col1, scenarios.profit[:, :, a, k], 'Monthly Profit'),
+                                   (col2, scenarios.be_units[:, :, a, k], 'Monthly Break-even Units (Sales Mix)')]:
+            with col:
+                st.plotly_chart(heatmap_figure(np.round(scenarios.demand_factors * 100, 1), np.round(scenarios.price_factors * 100, 1),
+                                               np.round(values, 2), title, 'Demand in %', 'Selling Price in %',
+                                               'RdYlGn' if title == 'Monthly Profit' else 'RdYlGn_r',
+                                               0 if title == 'Monthly Profit' else None))
+
+    # Add a divier
+    st.divider()
+
+    # Monte Carlo simulation
+    timer.start('Profit Simulation')
+    st.markdown("<h2 style='text-align: center;'>Profit Simulation 🎲</h2>", unsafe_allow_html=True)
+    if st.toggle('Simulate profit distribution', value=False):
+        col1, col2, col3 = st.columns(3)
+        draws = col1.select_slider('Simulated months', options=[10_000, 100_000, 1_000_000, 5_000_000], value=1_000_000)
+        seed = col2.number_input('Seed', min_value=0, value=0)
+        workers = col3.number_input('Worker processes', min_value=1, max_value=os.cpu_count() or 1, value=os.cpu_count() or 1)
+
+        # Ingredient prices follow their offer history, demand is Poisson around the planned demand
+        summary, counts, edges, elapsed = simulation_section(
+            file_key(SUPPLIER_CSV_PATH), tuple(book.products), quantities, ingredient_prices, monthly_demand,
+            selling_prices, cooking_time, hourly_rate, rent + salary, draws, seed, workers)
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Probability to Break Even", f"{summary['break_even_probability'] * 100:.1f}%")
+        col2.metric("Mean Profit", f"{summary['mean'] / 1000:.2f}k")
+        col3.metric("5% - 95% Profit", f"{summary['p5'] / 1000:.2f}k - {summary['p95'] / 1000:.2f}k")
+        col4.metric("Draws per Second", f"{draws / elapsed:,.0f}")
+
+        st.plotly_chart(histogram_figure((edges[:-1] + edges[1:]) / 2, counts, 'Simulated Monthly Profit', 'Profit in EUR',
+                                         'Simulated Months'))
+
+    # Add a divier
+    st.divider()
+
+    # Calculation flow
+    timer.start('Calculation Flow')
+    st.markdown("<h2 style='text-align: center;'>Calculation Flow</h2>", unsafe_allow_html=True)
+    flow_values = {key: graph.get(key) for key in flow_nodes(graph)}
+
+    # Display the model graph with the value of every node
+    st.graphviz_chart(flow_graph_section(tuple(book.codes), tuple(book.products), flow_values))
+
+    # The computation graph itself, nodes recomputed in this run are highlighted
+    if st.toggle('Show computation graph', value=False):
+        st.graphviz_chart(dag_source(graph))
+finally:
+    timer.close()
+export(timer)
+
+# Wall time and memory of every section
+if st.sidebar.toggle('Profiling panel', value=False, key='profiling'):
+    with st.sidebar.expander("Section Timings", expanded=True):
+        st.dataframe(pd.DataFrame({
+            'Section': list(timer.timings),
+            'Time in ms': [round(seconds * 1000, 1) for seconds in timer.timings.values()],
+            'Peak Memory in KiB': [round(timer.peak_memory[section] / 1024, 1) if section in timer.peak_memory else None
+                                   for section in timer.timings]
+        }), hide_index=True)
+
+        # Wall time of the last computation of every model node
+        st.dataframe(pd.DataFrame({
+            'Node': list(graph.timings),
+            'Time in ms': [round(seconds * 1000, 3) for seconds in graph.timings.values()],
+            'Recomputed': [node in graph.computed for node in graph.timings]
+        }), hide_index=True)
+
+        # Timings of all runs of this process, in the format scraped by Prometheus
+        st.download_button('Download metrics', stats.prometheus(), file_name='metrics.prom', mime='text/plain')
@@ -0,0 +1,153 @@
+import glob
+import hashlib
+import os
+from functools import lru_cache
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from ingest import STORE_DIR
+from supplier import STREAMING_FILE_BYTES, SUPPLIER_CSV_PATH, file_key, read_offers, select_best_offers
+
+
+def tables_dir(store_dir=STORE_DIR):
+    return os.path.join(store_dir, 'arrow')
+
+
+# Default location of the Arrow tables shared by all processes
+ARROW_DIR = tables_dir()
+
+
+def table_path(kind, csv_path=SUPPLIER_CSV_PATH, arrow_dir=ARROW_DIR):
+    """Arrow file of the ``kind`` table of a supplier file, named after the file key so a changed file gets a new one.
+
+    The name starts with the file name and a hash of its directory, so files
+    of the same name in different directories never replace each other.
+    """
+    key = file_key(csv_path)
+    directory = hashlib.sha1(os.path.dirname(key[0]).encode()).hexdigest()[:8]
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    return os.path.join(arrow_dir, f'{os.path.basename(key[0])}-{directory}-{kind}-{digest}.arrow')
+
+
+def _tmp_path(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return f'{path}.{os.getpid()}.tmp'
+
+
+def _publish(tmp_path, path):
+    os.replace(tmp_path, path)
+
+    # Tables of earlier versions of the same file and kind, processes that still map one keep reading it
+    for stale in glob.glob(glob.escape(path.rsplit('-', 1)[0]) + '-*.arrow'):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def write_table(df, path):
+    """Write a table as one uncompressed record batch, which can be mapped without any copy or decoding."""
+    tmp_path = _tmp_path(path)
+    feather.write_feather(df, tmp_path, compression='uncompressed', chunksize=max(len(df), 1))
+    _publish(tmp_path, path)
+
+
+def write_batches(frames, path):
+    """Write DataFrames of one schema as the record batches of one Arrow file, holding one frame at a time."""
+    tmp_path = _tmp_path(path)
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        writer = None
+        for df in frames:
+            batch = pa.RecordBatch.from_pandas(df, preserve_index=False)
+            if writer is None:
+                writer = pa.ipc.new_file(sink, batch.schema)
+            writer.write_batch(batch)
+        writer.close()
+    _publish(tmp_path, path)
+
+
+@lru_cache(maxsize=8)
+def open_arrow(path):
+    """Memory-map an Arrow file as an Arrow table, without any copy whatever its number of record batches."""
+    return pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+
+@lru_cache(maxsize=8)
+def open_table(path):
+    """Memory-map an Arrow file as a DataFrame.
+
+    Numeric columns without missing values of a single batch table point into
+    the mapped file, so all processes share their pages. The columns are
+    read-only. Tables of several batches are concatenated into private memory,
+    read those with ``offer_batches`` or ``reduce_offers`` instead.
+    """
+    return open_arrow(path).to_pandas(split_blocks=True)
+
+
+def _streamed(csv_path):
+    # Large files are parsed chunk by chunk and never held in memory at once, see streaming.py
+    return os.path.getsize(csv_path) >= STREAMING_FILE_BYTES
+
+
+def _write_offers(csv_path, arrow_dir, path):
+    if _streamed(csv_path):
+        from streaming import stream_offers
+        write_batches(stream_offers(csv_path), path)
+    else:
+        write_table(read_offers(csv_path), path)
+
+
+def _write_best_offers(csv_path, arrow_dir, path):
+    # Selected from the shared offers table batch by batch, the supplier file is parsed only once
+    write_table(reduce_offers(select_best_offers, csv_path, arrow_dir), path)
+
+
+def _shared_path(kind, csv_path, arrow_dir, write):
+    path = table_path(kind, csv_path, arrow_dir)
+    if not os.path.exists(path):
+        # The first process writes the table, a concurrent writer only replaces it with the same content
+        write(csv_path, arrow_dir, path)
+    return path
+
+
+def _shared_table(kind, csv_path, arrow_dir, write):
+    return open_table(_shared_path(kind, csv_path, arrow_dir, write))
+
+
+def load_shared_offers(csv_path=SUPPLIER_CSV_PATH, arrow_dir=ARROW_DIR):
+    """The cleaned supplier offers, parsed once by any process and memory-mapped by all others."""
+    return _shared_table('offers', csv_path, arrow_dir, _write_offers)
+
+
+def load_shared_best_offers(csv_path=SUPPLIER_CSV_PATH, arrow_dir=ARROW_DIR):
+    """The best offer of every product, selected once by any process and memory-mapped by all others."""
+    return _shared_table('best-offers', csv_path, arrow_dir, _write_best_offers)
+
+
+def shared_offers_table(csv_path=SUPPLIER_CSV_PATH, arrow_dir=ARROW_DIR):
+    """The shared offers as a memory-mapped Arrow table, e.g. to read a slice or count missing values of a large file."""
+    return open_arrow(_shared_path('offers', csv_path, arrow_dir, _write_offers))
+
+
+def offer_batches(csv_path=SUPPLIER_CSV_PATH, arrow_dir=ARROW_DIR):
+    """The shared offers as one DataFrame per record batch, large files in batches of ``streaming.CHUNK_ROWS``."""
+    table = shared_offers_table(csv_path, arrow_dir)
+    for batch in table.to_batches() or [table.slice(0, 0)]:
+        yield batch.to_pandas(split_blocks=True)
+
+
+def reduce_offers(reduce, csv_path=SUPPLIER_CSV_PATH, arrow_dir=ARROW_DIR):
+    """``reduce`` of the shared offers computed batch by batch, in memory bounded by a batch and the result.
+
+    ``reduce`` must return offers it gives again when applied to them with
+    more offers appended, like ``select_best_offers``. The running result
+    comes first, so ties resolve like in a single pass over the file.
+    """
+    result = None
+    for offers in offer_batches(csv_path, arrow_dir):
+        part = reduce(offers)
+        result = part if result is None else reduce(pd.concat([result, part], ignore_index=True))
+    return result
@@ -0,0 +1,46 @@
+import numpy as np
+
+
+def break_even_units(fixed_cost, price, unit_variable_cost):
+    """Units to sell until the contribution covers the fixed cost, for any number of products.
+
+    The inputs broadcast against each other. Products whose price does not
+    cover their variable cost never break even and get NaN.
+    """
+    contribution = np.asarray(price, dtype=float) - np.asarray(unit_variable_cost, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(contribution > 0, np.asarray(fixed_cost, dtype=float) / contribution, np.nan)
+
+
+def sales_mix_break_even(fixed_cost, prices, unit_variable_costs, mix):
+    """Break-even of several products sharing one fixed cost, sold in the proportions of ``mix``.
+
+    Returns the total units and the units of every product at break-even.
+    Products outside the mix do not count, even if their unit variable cost
+    is undefined.
+    """
+    mix = np.asarray(mix, dtype=float)
+    weights = mix / mix.sum() if mix.sum() > 0 else np.full(len(mix), np.nan)
+    contribution = np.asarray(prices, dtype=float) - np.asarray(unit_variable_costs, dtype=float)
+    with np.errstate(invalid='ignore'):
+        weighted = np.where(weights > 0, weights * contribution, 0.0).sum() if mix.sum() > 0 else np.nan
+    total_units = break_even_units(fixed_cost, weighted, 0.0)
+    return total_units, total_units * weights
+
+
+def break_even_lines(fixed_cost, price, unit_variable_cost, be_units, margin=1.5, default_units=1000.0):
+    """End points of the cost and revenue lines of a break-even chart for every product.
+
+    The lines run from zero to ``margin`` times the break-even units, or to
+    ``default_units`` for products that never break even. Returns the units,
+    total cost and total revenue as arrays of shape (products, 2).
+    """
+    fixed_cost, price, unit_variable_cost, be_units = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (fixed_cost, price, unit_variable_cost, be_units)))
+    max_units = np.where(np.isfinite(be_units) & (be_units > 0), be_units * margin, default_units)
+    units = np.stack([np.zeros_like(max_units), max_units], axis=-1)
+    # Products without demand have an infinite unit variable cost and get no cost line
+    with np.errstate(invalid='ignore'):
+        total_cost = fixed_cost[..., None] + unit_variable_cost[..., None] * units
+    total_revenue = price[..., None] * units
+    return units, total_cost, total_revenue
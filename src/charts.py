@@ -0,0 +1,234 @@
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+# Figures remembered per input data, the least recently used are evicted first
+FIGURE_CACHE_ENTRIES = 64
+
+# Most points of a line series and most cells along a heatmap axis sent to the browser
+MAX_POINTS = 2000
+MAX_GRID_SIZE = 100
+
+# Recipe subplots per row and height of a row of subplots in pixels
+SUBPLOTS_PER_ROW = 3
+SUBPLOT_HEIGHT = 400
+
+# Figures are built once per distinct input data and shared by all reruns and sessions.
+# st.plotly_chart only reads them, so the cached objects are never modified.
+figure_cache = st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+
+
+def downsample(x, y, max_points=MAX_POINTS):
+    """Reduce a line series to at most ``max_points`` points.
+
+    The series is split into buckets and the minimum and maximum of every
+    bucket are kept in their original order, so peaks stay visible.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    if len(y) <= max_points:
+        return x, y
+    buckets = np.array_split(np.arange(len(y)), max_points // 2)
+    keep = []
+    for bucket in buckets:
+        values = y[bucket]
+        if np.isnan(values).all():
+            keep.append(bucket[0])
+            continue
+        keep.extend(sorted({bucket[np.nanargmin(values)], bucket[np.nanargmax(values)]}))
+    keep = np.array(keep)
+    return x[keep], y[keep]
+
+
+def downsample_grid(x, y, z, max_size=MAX_GRID_SIZE):
+    """Reduce a heatmap to at most ``max_size`` cells along each axis by taking every n-th row and column."""
+    x_step = -(-len(x) // max_size)
+    y_step = -(-len(y) // max_size)
+    return x[::x_step], y[::y_step], z[::y_step, ::x_step]
+
+
+def _subplot_grid(names, title, xaxis_title, yaxis_title):
+    # Layout of one subplot per recipe wrapped into rows like the recipe columns of the page, spaced
+    # like plotly's make_subplots. The layout is built as a plain dict so the figure is validated once.
+    rows = -(-len(names) // SUBPLOTS_PER_ROW)
+    cols = min(len(names), SUBPLOTS_PER_ROW)
+    h_spacing, v_spacing = 0.2 / cols, 0.3 / rows
+    width = (1 - h_spacing * (cols - 1)) / cols
+    height = (1 - v_spacing * (rows - 1)) / rows
+
+    layout = {'title': {'text': title}, 'height': max(450, SUBPLOT_HEIGHT * rows), 'annotations': []}
+    for r, name in enumerate(names):
+        row, col = divmod(r, SUBPLOTS_PER_ROW)
+        x0 = col * (width + h_spacing)
+        y1 = 1 - row * (height + v_spacing)
+        axis = _axis(r)
+        layout[f'xaxis{axis}'] = {'domain': [x0, min(x0 + width, 1.0)], 'anchor': f'y{axis}', 'title': {'text': xaxis_title}}
+        layout[f'yaxis{axis}'] = {'domain': [max(y1 - height, 0.0), y1], 'anchor': f'x{axis}'}
+        if col == 0:
+            layout[f'yaxis{axis}']['title'] = {'text': yaxis_title}
+        layout['annotations'].append({'text': name, 'x': x0 + width / 2, 'y': y1, 'xref': 'paper', 'yref': 'paper',
+                                      'xanchor': 'center', 'yanchor': 'bottom', 'showarrow': False,
+                                      'font': {'size': 16}})
+    return layout
+
+
+def _axis(r):
+    # Axis suffix of the subplot of recipe r
+    return '' if r == 0 else r + 1
+
+
+@figure_cache
+def demand_figure(names, monthly_demand):
+    """Bar chart of the monthly demand of every recipe."""
+    fig = go.Figure(go.Bar(
+        x=list(names),
+        y=monthly_demand,
+        marker_color='green',
+        text=monthly_demand,
+        textposition='auto',
+        textfont=dict(size=18)
+    ))
+    fig.update_layout(
+        title='Monthly Demand of Guacamole',
+        xaxis_title='Guacamole',
+        yaxis_title='Monthly Demand',
+        template='plotly_white'
+    )
+    return fig
+
+
+@figure_cache
+def ingredient_demand_figure(names, products, uses, daily_ingredient_demand, days):
+    """Daily and monthly demand of the ingredients of every recipe, one subplot per recipe."""
+    layout = _subplot_grid(names, 'Daily and Monthly Demand of Guacamole Ingredients', 'Ingredients', 'Demand')
+    traces = []
+    for r in range(len(names)):
+        ingredients = np.flatnonzero(uses[r])
+        labels = [products[i] for i in ingredients]
+        daily = daily_ingredient_demand[r, ingredients]
+        for name, values, color in [('Daily Demand', daily, 'green'), ('Monthly Demand', daily * days, 'blue')]:
+            traces.append(go.Bar(
+                x=labels,
+                y=values,
+                name=name,
+                legendgroup=name,
+                showlegend=r == 0,
+                marker_color=color,
+                text=values,
+                textposition='auto',
+                textfont=dict(size=14),
+                xaxis=f'x{_axis(r)}',
+                yaxis=f'y{_axis(r)}'
+            ))
+    layout.update(barmode='group', template='plotly_white')
+    return go.Figure(data=traces, layout=layout)
+
+
+@figure_cache
+def product_bar_figure(products, values, value_column, title):
+    """One coloured bar and legend entry per product."""
+    fig = go.Figure([
+        go.Bar(x=[product], y=[value], name=product, text=[value], textposition='auto')
+        for product, value in zip(products, values)
+    ])
+    fig.update_layout(title=title,
+                      yaxis_title=value_column,
+                      xaxis_title='Products',
+                      xaxis_tickangle=-45,
+                      legend_title_text='Product')
+    return fig
+
+
+@figure_cache
+def profit_gauge_figure(total_revenue, total_cost, profit):
+    """Gauge of the profit within the revenue, next to the total revenue and cost."""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=profit,
+        title={'text': "Profit"},
+        delta={'reference': total_cost, 'relative': False},
+        gauge={
+            'axis': {'range': [0, total_revenue]},
+            'bar': {'color': "green"},
+            'steps': [
+                {'range': [0, total_cost], 'color': "red"},
+                {'range': [total_cost, total_revenue], 'color': "yellow"}
+            ],
+            'threshold': {
+                'line': {'color': "blue", 'width': 4},
+                'thickness': 0.75,
+                'value': profit
+            }
+        }
+    ))
+    fig.add_trace(go.Indicator(
+        mode="number",
+        value=total_revenue,
+        title={'text': "Total Revenue"},
+        domain={'x': [0.1, 0.3], 'y': [0.1, 0.3]}
+    ))
+    fig.add_trace(go.Indicator(
+        mode="number",
+        value=total_cost,
+        title={'text': "Total Cost"},
+        domain={'x': [0.7, 0.9], 'y': [0.1, 0.3]}
+    ))
+    fig.update_layout(margin=dict(l=50, r=50, t=50, b=50))
+    return fig
+
+
+@figure_cache
+def break_even_figure(names, units, cost, revenue, be_units, unit_vc, avg_fixed_cost):
+    """Cost and revenue lines with the break-even point of every recipe, one subplot per recipe.
+
+    ``units``, ``cost`` and ``revenue`` are the line end points of ``breakeven.break_even_lines``.
+    """
+    layout = _subplot_grid(names, 'Break-even Analysis', 'Units Sold', 'EUR')
+    traces = []
+    shown = set()
+    for r in range(len(names)):
+        lines = [('Total Cost', units[r], cost[r], 'red', 'solid'), ('Total Revenue', units[r], revenue[r], 'green', 'solid')]
+
+        if np.isfinite(be_units[r]):
+            break_even_x = be_units[r]
+            break_even_y = avg_fixed_cost + unit_vc[r] * break_even_x
+            lines.append(('Break-even line', [break_even_x, break_even_x], [0, break_even_y], 'blue', 'dash'))
+            layout['annotations'].append(dict(x=break_even_x, y=break_even_y, xref=f'x{_axis(r)}', yref=f'y{_axis(r)}',
+                                              text=f'{int(break_even_x)}', showarrow=True, arrowhead=2, ax=0, ay=-40,
+                                              font=dict(color='blue')))
+
+        for name, x, y, color, dash in lines:
+            traces.append(go.Scatter(x=x, y=y, mode='lines', name=name, legendgroup=name, showlegend=name not in shown,
+                                     line=dict(color=color, dash=dash), xaxis=f'x{_axis(r)}', yaxis=f'y{_axis(r)}'))
+            shown.add(name)
+    return go.Figure(data=traces, layout=layout)
+
+
+@figure_cache
+def heatmap_figure(x, y, z, title, xaxis_title, yaxis_title, colorscale, zmid=None):
+    """Heatmap of ``z`` over the grid ``x`` by ``y``, downsampled for large grids."""
+    x, y, z = downsample_grid(np.asarray(x), np.asarray(y), np.asarray(z))
+    fig = go.Figure(go.Heatmap(x=x, y=y, z=z, colorscale=colorscale, zmid=zmid))
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        template='plotly_white'
+    )
+    return fig
+
+
+@figure_cache
+def histogram_figure(centers, counts, title, xaxis_title, yaxis_title):
+    """Pre-binned histogram with a marker at zero, downsampled for many bins."""
+    centers, counts = downsample(centers, counts)
+    fig = go.Figure(go.Bar(x=centers, y=counts, marker_color='green'))
+    fig.add_vline(x=0, line=dict(color='red', dash='dash'))
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        bargap=0,
+        template='plotly_white'
+    )
+    return fig
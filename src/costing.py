@@ -0,0 +1,56 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Demand is planned for months of 30 days
+DAYS_PER_MONTH = 30
+
+
+# Per-recipe results of the costing engine, money values are per month except the unit cost
+Costing = namedtuple('Costing', [
+    'ingredient_costs', 'unit_cost', 'monthly_demand', 'monthly_cost',
+    'revenue', 'cooking_time', 'variable_cost', 'profit',
+])
+
+
+def ingredient_cost(quantities, prices, monthly_demand):
+    """Cost of every ingredient of every recipe, the unit cost and the monthly cost of every recipe."""
+    ingredient_costs = np.asarray(quantities, dtype=float) * np.asarray(prices, dtype=float)
+    unit_cost = ingredient_costs.sum(axis=1)
+    monthly_cost = np.round(unit_cost * monthly_demand, 2)
+    return ingredient_costs, unit_cost, monthly_cost
+
+
+def revenue(selling_prices, monthly_demand):
+    """Monthly revenue of every recipe."""
+    return np.round(np.asarray(selling_prices, dtype=float) * monthly_demand, 2)
+
+
+def cooking_cost(cooking_minutes, monthly_demand, hourly_rate):
+    """Monthly cooking hours and cooking cost of every recipe."""
+    cooking_time = (np.asarray(cooking_minutes, dtype=float) * monthly_demand) / 60
+    return cooking_time, np.round(cooking_time * hourly_rate, 2)
+
+
+def cost_model(quantities, prices, demand, selling_prices, cooking_minutes=None, hourly_rate=0.0, days=DAYS_PER_MONTH):
+    """Cost every recipe of the menu in one vectorized pass.
+
+    ``quantities`` is the recipe x ingredient quantity matrix, ``prices`` the
+    price per unit of every ingredient, ``demand`` the daily demand and
+    ``selling_prices`` the selling price of every recipe. ``cooking_minutes``
+    is the preparation time of one unit of every recipe and ``hourly_rate``
+    the variable cost of one hour of cooking.
+
+    Money values are rounded to cents like on the dashboard. ``profit`` is the
+    contribution of every recipe before fixed costs.
+    """
+    monthly_demand = np.asarray(demand, dtype=float) * days
+    if cooking_minutes is None:
+        cooking_minutes = np.zeros(len(quantities))
+
+    ingredient_costs, unit_cost, monthly_cost = ingredient_cost(quantities, prices, monthly_demand)
+    monthly_revenue = revenue(selling_prices, monthly_demand)
+    cooking_time, variable_cost = cooking_cost(cooking_minutes, monthly_demand, hourly_rate)
+    profit = monthly_revenue - monthly_cost - variable_cost
+
+    return Costing(ingredient_costs, unit_cost, monthly_demand, monthly_cost, monthly_revenue, cooking_time, variable_cost, profit)
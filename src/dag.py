@@ -0,0 +1,93 @@
+import time
+
+import numpy as np
+
+
+def unchanged(previous, value):
+    """Whether a new value equals the previous one, NaN equal to NaN."""
+    try:
+        return np.array_equal(previous, value, equal_nan=True)
+    except TypeError:
+        # Values that are not numeric arrays, e.g. lists of named rates
+        return np.array_equal(np.asarray(previous, dtype=object), np.asarray(value, dtype=object))
+
+
+class Graph:
+    """Computation DAG with lazy recomputation of dirty nodes.
+
+    Inputs are set with ``set``, computations are declared with ``node`` and
+    read with ``get``. Changing an input marks only the nodes downstream of it
+    dirty, and a dirty node is recomputed the next time it or a node depending
+    on it is read.
+    """
+
+    def __init__(self):
+        self.inputs = []
+        self.functions = {}
+        self.dependencies = {}
+        self.dependents = {}
+        self.values = {}
+        self.dirty = set()
+
+        # Nodes computing several results at once and the nodes reading each result
+        self.bundles = {}
+
+        # Wall time of the last computation of every node and the nodes computed since the last reset
+        self.timings = {}
+        self.computed = []
+
+    def input(self, name, value=None):
+        self.inputs.append(name)
+        self.dependencies[name] = []
+        self.dependents.setdefault(name, [])
+        self.values[name] = value
+
+    def node(self, name, dependencies, function):
+        """Declare ``name`` as ``function`` of the values of ``dependencies``, which must exist already."""
+        self.functions[name] = function
+        self.dependencies[name] = list(dependencies)
+        self.dependents.setdefault(name, [])
+        for dependency in dependencies:
+            self.dependents[dependency].append(name)
+        self.dirty.add(name)
+
+    def split(self, name, dependencies, function, outputs):
+        """Declare ``name`` as ``function`` returning a tuple and one node per item named after ``outputs``."""
+        self.node(name, dependencies, function)
+        self.bundles[name] = list(outputs)
+        for k, output in enumerate(outputs):
+            self.node(output, [name], lambda result, k=k: result[k])
+
+    def downstream(self, name):
+        """All nodes depending directly or indirectly on ``name``."""
+        found = set()
+        stack = list(self.dependents[name])
+        while stack:
+            node = stack.pop()
+            if node not in found:
+                found.add(node)
+                stack.extend(self.dependents[node])
+        return found
+
+    def set(self, name, value):
+        """Change an input, marking its downstream nodes dirty if the value differs."""
+        if unchanged(self.values[name], value):
+            return
+        self.values[name] = value
+        self.dirty |= self.downstream(name)
+
+    def get(self, name):
+        if name in self.dirty:
+            arguments = [self.get(dependency) for dependency in self.dependencies[name]]
+            start = time.perf_counter()
+            self.values[name] = self.functions[name](*arguments)
+            self.timings[name] = time.perf_counter() - start
+            self.computed.append(name)
+            self.dirty.discard(name)
+        return self.values[name]
+
+    def reset_stats(self):
+        self.computed = []
+
+    def edges(self):
+        return [(dependency, name) for name, dependencies in self.dependencies.items() for dependency in dependencies]
@@ -0,0 +1,152 @@
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from dag import unchanged
+from model import model_graph
+
+# Node attributes of the value nodes, by section of the model
+NODE_COLORS = {'revenue': 'green', 'cost': 'lightcoral', 'profit': 'orange', 'break_even': 'lightblue'}
+
+# Vectors of these nodes hold a value per ingredient product, all other vectors one per recipe
+PRODUCT_VALUES = ['prices']
+
+# Value lines of a label, longer values end with the number of lines left out
+LABEL_LINES = 12
+
+
+def _quote(text):
+    return '"' + str(text).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+
+def _attributes(label, attributes):
+    items = ([f'label={_quote(label)}'] if label is not None else []) + [f'{key}={_quote(value)}' for key, value in attributes]
+    return f" [{' '.join(items)}]" if items else ''
+
+
+def _number(value):
+    # Money values with cents, small values such as prices per gram with four significant digits
+    value = float(value)
+    return f'{value:,.2f}' if abs(value) >= 1 else f'{value:.4g}'
+
+
+def value_label(name, value, codes, products):
+    """Label of a node of the model graph, its name and value, listed per recipe or product for arrays.
+
+    Matrices are recipe x ingredient and are summed over the recipes. Named
+    rates are listed by name, other tuples such as chart lines only named.
+    """
+    if isinstance(value, (list, tuple)):
+        if not all(isinstance(item, tuple) and len(item) == 2 for item in value):
+            return name
+        lines = [f'{key}: {_number(item)}' for key, item in value]
+    else:
+        value = np.asarray(value, dtype=float)
+        if value.ndim == 0:
+            return f'{name}: {_number(value)}'
+        if value.ndim == 2:
+            value, keys = value.sum(axis=0), products
+        else:
+            keys = products if name in PRODUCT_VALUES else codes
+        lines = [f'{key}: {_number(item)}' for key, item in zip(keys, value)]
+    if len(lines) > LABEL_LINES:
+        lines = lines[:LABEL_LINES - 1] + [f'{len(lines) - LABEL_LINES + 1} more']
+    return '\n'.join([name] + lines)
+
+
+def _color(name, break_even):
+    # Revenue nodes are named after it, the break-even section is everything computed from its results
+    if name == 'profit':
+        return NODE_COLORS['profit']
+    if name in break_even:
+        return NODE_COLORS['break_even']
+    return NODE_COLORS['revenue'] if 'revenue' in name else NODE_COLORS['cost']
+
+
+def flow_nodes(graph):
+    """Nodes of a computation graph labelled with their value on the flow graph, all but the bundles."""
+    return [name for name in graph.dependencies if name not in graph.bundles]
+
+
+class FlowGraph:
+    """DOT source of the Calculation Flow graph, patched in place when values change.
+
+    The nodes and edges are those of the computation graph of the model, see
+    ``model.model_graph``, and are built once per menu. Inputs are boxes and
+    bundles of several results are points. Every label is formatted from the
+    value of its node, so a new set of values only re-formats the labels whose
+    values changed.
+    """
+
+    def __init__(self, graph, codes, products):
+        self._codes = list(codes)
+        self._products = list(products)
+
+        # Statements as (node or edge ids, value key, attributes)
+        self._statements = []
+        break_even = graph.downstream('break_even') if 'break_even' in graph.bundles else set()
+        for name in graph.dependencies:
+            if name in graph.bundles:
+                self._statements.append(((name,), None, (('label', ''), ('shape', 'point'))))
+            elif name in graph.inputs:
+                self._statements.append(((name,), name, (('shape', 'box'),)))
+            else:
+                self._statements.append(((name,), name, (('fillcolor', _color(name, break_even)),
+                                                          ('shape', 'ellipse'), ('style', 'filled'))))
+        for tail, head in graph.edges():
+            self._statements.append(((tail, head), None, ()))
+
+        self._values = {}
+        self._lines = [None] * len(self._statements)
+        self._source = None
+        self._lock = threading.Lock()
+
+    def _changed(self, values):
+        return {key for key, value in values.items() if key not in self._values or not unchanged(self._values[key], value)}
+
+    def source(self, values):
+        """DOT source of the graph with the labels of ``values``, the values of ``flow_nodes``."""
+        with self._lock:
+            changed = self._changed(values)
+            if not changed and self._source is not None:
+                return self._source
+
+            for s, (ids, key, attributes) in enumerate(self._statements):
+                if self._lines[s] is not None and key not in changed:
+                    continue
+                text = value_label(key, values[key], self._codes, self._products) if key is not None else None
+                self._lines[s] = '\t' + ' -> '.join(map(_quote, ids)) + _attributes(text, attributes)
+
+            self._values = {key: value.copy() if isinstance(value, np.ndarray) else value for key, value in values.items()}
+            self._source = 'digraph {\n' + '\n'.join(self._lines) + '\n\trankdir=LR\n}\n'
+            return self._source
+
+
+@lru_cache(maxsize=8)
+def flow_graph(codes, products):
+    """Flow graph of the model of a menu, built once per menu.
+
+    ``codes`` are the recipe codes and ``products`` the ingredient products of
+    the recipe registry, both as tuples.
+    """
+    return FlowGraph(model_graph(), codes, products)
+
+
+def dag_source(graph):
+    """DOT source of a computation graph with the last computation time of every node.
+
+    Inputs are boxes, nodes computed since the last ``reset_stats`` are filled.
+    """
+    computed = set(graph.computed)
+    lines = []
+    for name in graph.dependencies:
+        if name in graph.inputs:
+            lines.append('\t' + _quote(name) + _attributes(name, (('shape', 'box'),)))
+            continue
+        label = f"{name}: {graph.timings[name] * 1000:.3f} ms" if name in graph.timings else name
+        fill = NODE_COLORS['profit'] if name in computed else 'white'
+        lines.append('\t' + _quote(name) + _attributes(label, (('fillcolor', fill), ('shape', 'ellipse'), ('style', 'filled'))))
+    for tail, head in graph.edges():
+        lines.append(f'\t{_quote(tail)} -> {_quote(head)}')
+    return 'digraph {\n' + '\n'.join(lines) + '\n\trankdir=LR\n}\n'
@@ -0,0 +1,110 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from arrow_store import reduce_offers
+from ingest import STORE_DIR, best_offers_path, load_history
+from supplier import PRICE_DECIMALS, SUPPLIER_CSV_PATH, file_key
+
+
+def daily_prices(offers):
+    """The cheapest price per unit of every product and offer date, as offers with these three columns."""
+    offers = offers[offers['Date of Offer'].notna()]
+    daily = offers.groupby(['Product', 'Date of Offer'], observed=True, sort=True)['Price per Unit'].min()
+    return daily.reset_index()
+
+
+class PriceHistory:
+    """Sorted price history of every product answering as-of price lookups.
+
+    The price of a product as of a date is the cheapest offer of the most
+    recent offer date on or before it, the rule of ``select_best_offers``
+    applied to the offers known at that date. The history holds one entry per
+    product and offer date, sorted by product and date into a single key, so
+    any number of (product, date) pairs is answered by one binary search.
+    """
+
+    def __init__(self, offers):
+        offers = offers[offers['Date of Offer'].notna()]
+        daily = (offers.assign(Product=offers['Product'].astype(str))
+                 .groupby(['Product', 'Date of Offer'], observed=True, sort=True)['Price per Unit'].min())
+
+        self.products = list(daily.index.get_level_values(0).unique())
+        codes = pd.Categorical(daily.index.get_level_values(0), categories=self.products).codes.astype(np.int64)
+        days = daily.index.get_level_values(1).to_numpy().astype('datetime64[D]').astype(np.int64)
+        self.first_date = np.datetime64(int(days.min()), 'D') if len(days) else None
+        self.last_date = np.datetime64(int(days.max()), 'D') if len(days) else None
+
+        # Key of a product and day, increasing by product first and by day within a product
+        self._first_day = int(days.min()) if len(days) else 0
+        self._span = int(days.max()) - self._first_day + 2 if len(days) else 1
+        self._keys = codes * self._span + (days - self._first_day)
+        self._entry_codes = codes
+        self._prices = np.round(daily.to_numpy(dtype=float), PRICE_DECIMALS)
+
+        # First offer day of every product, the entries of a product start with it
+        self._first_days = days[np.searchsorted(codes, np.arange(len(self.products)))]
+
+    def first_complete_date(self, products):
+        """First date on which every one of ``products`` has a price, None if one of them has no offer at all."""
+        codes = pd.Categorical(list(products), categories=self.products).codes
+        if not len(codes) or (codes < 0).any():
+            return None
+        return np.datetime64(int(self._first_days[codes].max()), 'D')
+
+    def lookup(self, products, dates):
+        """Prices of ``products`` as of ``dates``, broadcast against each other, NaN before the first offer."""
+        codes = pd.Categorical(np.ravel(products), categories=self.products).codes.astype(np.int64)
+        codes = codes.reshape(np.shape(products))
+        days = np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+        codes, days = np.broadcast_arrays(codes, days)
+        if not len(self._keys):
+            return np.full(codes.shape, np.nan)
+
+        # Days before the history end at the key of the previous product and are rejected below
+        keys = codes * self._span + np.clip(days - self._first_day, -1, self._span - 2)
+        entries = np.searchsorted(self._keys, keys, side='right') - 1
+        found = (codes >= 0) & (entries >= 0) & (self._entry_codes[np.maximum(entries, 0)] == codes)
+        return np.where(found, self._prices[np.maximum(entries, 0)], np.nan)
+
+    def vector(self, products, date):
+        """Prices of ``products`` as of ``date`` as a float array, like ``supplier.price_vector``."""
+        return self.lookup(list(products), np.datetime64(date, 'D'))
+
+    def prices(self, date):
+        """Map every product with an offer on or before ``date`` to its price."""
+        values = self.vector(self.products, date)
+        return {product: price for product, price in zip(self.products, values) if not np.isnan(price)}
+
+    def series(self, products, dates):
+        """Table of the prices of ``products`` (columns) over ``dates`` (rows), e.g. of a period."""
+        dates = pd.DatetimeIndex(dates)
+        values = self.lookup(np.asarray(list(products), dtype=object)[None, :], dates.to_numpy()[:, None])
+        return pd.DataFrame(values, index=dates, columns=list(products))
+
+
+@lru_cache(maxsize=4)
+def _cached_price_history(path, mtime_ns, size):
+    # Reduced batch by batch, the history of a large file is bounded by products x offer days
+    return PriceHistory(reduce_offers(daily_prices, path))
+
+
+@lru_cache(maxsize=4)
+def _cached_store_price_history(store_dir, path, mtime_ns, size):
+    return PriceHistory(daily_prices(load_history(store_dir)))
+
+
+def load_price_history(path=SUPPLIER_CSV_PATH, store_dir=STORE_DIR):
+    """Load the price history the current prices come from, rebuilt only when it changed on disk.
+
+    Like ``ingest.load_current_best_offers`` the offer store wins over the
+    supplier file once offers have been ingested into it, so the prices as of
+    the last date equal the current prices.
+    """
+    store_path = best_offers_path(store_dir)
+    if os.path.exists(store_path):
+        # The best offers are materialized on every ingest, their key changes with the stored history
+        return _cached_store_price_history(store_dir, *file_key(store_path))
+    return _cached_price_history(*file_key(path))
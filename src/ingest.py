@@ -0,0 +1,126 @@
+import argparse
+import os
+import time
+from functools import lru_cache
+
+import pandas as pd
+
+from supplier import CATEGORICAL_COLUMNS, SUPPLIER_CSV_PATH, file_key, read_offers, select_best_offers
+
+# Default location of the local offer store
+STORE_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'store')
+
+# An offer is identified by the product, the supplier and the offer date
+KEY_COLUMNS = ['Product-ID', 'Supplier', 'Date of Offer']
+
+
+def offers_dir(store_dir=STORE_DIR):
+    return os.path.join(store_dir, 'offers')
+
+
+def best_offers_path(store_dir=STORE_DIR):
+    return os.path.join(store_dir, 'best-offers.parquet')
+
+
+def _to_parquet(df, path):
+    # Categories are stored as plain strings so the part files can be read together
+    df = df.copy()
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype(str)
+    tmp_path = path + '.tmp'
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _read_parquet(path, columns=None):
+    df = pd.read_parquet(path, columns=columns)
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    return df
+
+
+def _stored_keys(store_dir):
+    # Only the key columns of the history are read to find already stored offers
+    directory = offers_dir(store_dir)
+    if not os.path.isdir(directory) or not os.listdir(directory):
+        return None
+    keys = pd.read_parquet(directory, columns=KEY_COLUMNS)
+    keys['Supplier'] = keys['Supplier'].astype(str)
+    return keys
+
+
+def ingest_offers(offers, store_dir=STORE_DIR):
+    """Append the offers not yet in the store and refresh the best offer table.
+
+    Returns the number of newly stored offers.
+    """
+    offers = offers.drop_duplicates(KEY_COLUMNS)
+
+    # Anti-join against the stored keys
+    new_offers = offers
+    stored_keys = _stored_keys(store_dir)
+    if stored_keys is not None:
+        keys = offers[KEY_COLUMNS].assign(Supplier=offers['Supplier'].astype(str))
+        merged = keys.merge(stored_keys, on=KEY_COLUMNS, how='left', indicator=True)
+        new_offers = offers[(merged['_merge'] == 'left_only').values]
+    if new_offers.empty:
+        return 0
+
+    # Append the new rows as a separate part file
+    os.makedirs(offers_dir(store_dir), exist_ok=True)
+    part_name = f'part-{time.time_ns()}.parquet'
+    _to_parquet(new_offers.reset_index(drop=True), os.path.join(offers_dir(store_dir), part_name))
+
+    # Only the current best offers and the new rows compete for the new best offers
+    candidates = select_best_offers(new_offers)
+    path = best_offers_path(store_dir)
+    if os.path.exists(path):
+        candidates = pd.concat([_read_parquet(path), candidates], ignore_index=True)
+        for column in CATEGORICAL_COLUMNS:
+            candidates[column] = candidates[column].astype('category')
+    _to_parquet(select_best_offers(candidates), path)
+
+    return len(new_offers)
+
+
+def ingest_offer_file(csv_path, store_dir=STORE_DIR):
+    """Parse a supplier offer file and append its new offers to the store."""
+    return ingest_offers(read_offers(csv_path), store_dir)
+
+
+def load_history(store_dir=STORE_DIR):
+    """Read the full stored offer history."""
+    return _read_parquet(offers_dir(store_dir))
+
+
+@lru_cache(maxsize=4)
+def _cached_store_best_offers(path, mtime_ns, size):
+    return _read_parquet(path)
+
+
+def load_current_best_offers(store_dir=STORE_DIR, csv_path=SUPPLIER_CSV_PATH):
+    """Read the materialized best offers, falling back to the supplier CSV without a store.
+
+    The best offers of the CSV are selected once and shared by all processes as a memory-mapped Arrow table.
+    """
+    path = best_offers_path(store_dir)
+    if os.path.exists(path):
+        return _cached_store_best_offers(*file_key(path))
+    from arrow_store import load_shared_best_offers, tables_dir
+    return load_shared_best_offers(csv_path, tables_dir(store_dir))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Append new supplier offer files to the local offer store.')
+    parser.add_argument('files', nargs='+', help='semicolon separated supplier offer files')
+    parser.add_argument('--store', default=STORE_DIR, help='offer store directory')
+    args = parser.parse_args()
+
+    for csv_path in args.files:
+        added = ingest_offer_file(csv_path, args.store)
+        print(f'{csv_path}: {added} new offers')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+from collections import namedtuple
+
+import numpy as np
+
+from breakeven import break_even_lines, break_even_units, sales_mix_break_even
+from costing import DAYS_PER_MONTH, cooking_cost, cost_model, ingredient_cost, revenue
+from dag import Graph
+
+# Dashboard defaults of the monthly fixed costs and the hourly cooking rate (salary, energy and other costs)
+DEFAULT_RENT = 1500.0
+DEFAULT_SALARY = 1250.0
+DEFAULT_HOURLY_RATE = 11.0 + 4.5 + 2.75
+
+# Inputs of one outlet, arrays are per recipe except the recipe x ingredient quantities
+Outlet = namedtuple('Outlet', [
+    'name', 'quantities', 'daily_demand', 'selling_prices', 'cooking_minutes',
+    'hourly_rate', 'rent', 'salary',
+])
+
+# Inputs of the computation graph of the model
+GRAPH_INPUTS = ['quantities', 'prices', 'daily_demand', 'selling_prices', 'cooking_minutes', 'rates', 'rent', 'salary']
+
+# Results of the financial model of one outlet, money values are per month
+Evaluation = namedtuple('Evaluation', [
+    'monthly_demand', 'ingredient_costs', 'unit_cost', 'monthly_cost', 'revenue', 'cooking_time', 'variable_cost',
+    'total_revenue', 'total_ingredients_cost', 'total_variable_cost', 'total_fixed_cost', 'total_cost', 'profit',
+    'unit_vc', 'avg_fixed_cost', 'be_units', 'be_total_units', 'be_mix_units',
+])
+
+
+def default_outlet(book, name='default', **changes):
+    """Outlet with the recipe registry and the dashboard defaults, ``changes`` replace single inputs."""
+    outlet = Outlet(name, book.quantities, book.daily_demand, book.selling_prices, book.cooking_minutes,
+                    DEFAULT_HOURLY_RATE, DEFAULT_RENT, DEFAULT_SALARY)
+    return outlet._replace(**changes)
+
+
+def totals(monthly_revenue, monthly_ingredient_cost, monthly_cooking_cost, rent, salary):
+    """Total revenue, ingredient, variable, fixed and total cost and the profit of a month."""
+    total_revenue = monthly_revenue.sum()
+    total_ingredients_cost = monthly_ingredient_cost.sum()
+    total_variable_cost = monthly_cooking_cost.sum()
+    total_fixed_cost = rent + salary
+    total_cost = total_variable_cost + total_fixed_cost + total_ingredients_cost
+    profit = round(total_revenue - total_cost, 2)
+    return total_revenue, total_ingredients_cost, total_variable_cost, total_fixed_cost, total_cost, profit
+
+
+def break_even(total_fixed_cost, selling_prices, monthly_demand, unit_cost, variable_cost):
+    """Break-even of every recipe with the fixed costs split evenly, and of the sales mix.
+
+    Returns the unit variable cost and break-even units of every recipe, the
+    fixed cost share of a recipe, the total break-even units of the sales mix
+    and the units of every recipe at that break-even. Both count the full
+    variable cost of a unit, its ingredients ``unit_cost`` and its share of
+    the monthly cooking ``variable_cost`` of its recipe.
+    """
+    recipes = len(selling_prices)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        unit_variable_cost = np.asarray(unit_cost, dtype=float) + np.asarray(variable_cost, dtype=float) / monthly_demand
+    unit_vc = np.round(unit_variable_cost, 2)
+    avg_fixed_cost = round(total_fixed_cost / recipes, 2)
+    be_units = np.round(break_even_units(avg_fixed_cost, selling_prices, unit_vc), 0)
+    be_total_units, be_mix_units = sales_mix_break_even(total_fixed_cost, selling_prices, unit_variable_cost,
+                                                        monthly_demand)
+    return unit_vc, avg_fixed_cost, be_units, be_total_units, be_mix_units
+
+
+def evaluate(outlet, prices, days=DAYS_PER_MONTH):
+    """Evaluate the monthly financial model of an outlet at the ingredient ``prices``.
+
+    ``prices`` is the price per unit of every ingredient column of the
+    quantity matrix. The results are those shown on the dashboard.
+    """
+    costing = cost_model(outlet.quantities, prices, outlet.daily_demand, outlet.selling_prices,
+                         outlet.cooking_minutes, outlet.hourly_rate, days)
+
+    (total_revenue, total_ingredients_cost, total_variable_cost, total_fixed_cost,
+     total_cost, profit) = totals(costing.revenue, costing.monthly_cost, costing.variable_cost, outlet.rent, outlet.salary)
+    unit_vc, avg_fixed_cost, be_units, be_total_units, be_mix_units = break_even(
+        total_fixed_cost, outlet.selling_prices, costing.monthly_demand, costing.unit_cost, costing.variable_cost)
+
+    return Evaluation(costing.monthly_demand, costing.ingredient_costs, costing.unit_cost, costing.monthly_cost,
+                      costing.revenue, costing.cooking_time, costing.variable_cost, total_revenue,
+                      total_ingredients_cost, total_variable_cost, total_fixed_cost, total_cost, profit, unit_vc, avg_fixed_cost, be_units, be_total_units, be_mix_units)
+
+
+def model_graph(days=DAYS_PER_MONTH):
+    """The financial model as a computation graph, see ``dag.Graph``.
+
+    ``rates`` are the named hourly cooking cost rates as (name, rate) pairs.
+    Node names match the values of ``Evaluation``.
+    """
+    graph = Graph()
+    for name in GRAPH_INPUTS:
+        graph.input(name)
+
+    # Demand
+    graph.node('monthly_demand', ['daily_demand'], lambda daily_demand: np.asarray(daily_demand, dtype=float) * days)
+    graph.node('daily_ingredient_demand', ['quantities', 'daily_demand'],
+               lambda quantities, daily_demand: quantities * np.asarray(daily_demand, dtype=float)[:, None])
+
+    # Ingredient costs
+    graph.split('costing', ['quantities', 'prices', 'monthly_demand'], ingredient_cost,
+                ['ingredient_costs', 'unit_cost', 'monthly_cost'])
+
+    # Revenue and cooking costs
+    graph.node('revenue', ['selling_prices', 'monthly_demand'], revenue)
+    graph.node('hourly_rate', ['rates'], lambda rates: sum(rate for _, rate in rates))
+    graph.split('cooking', ['cooking_minutes', 'monthly_demand', 'hourly_rate'], cooking_cost,
+                ['cooking_time', 'variable_cost'])
+
+    # Totals and profit
+    graph.split('totals', ['revenue', 'monthly_cost', 'variable_cost', 'rent', 'salary'], totals,
+                ['total_revenue', 'total_ingredients_cost', 'total_variable_cost', 'total_fixed_cost', 'total_cost',
+                 'profit'])
+
+    # Break-even
+    graph.split('break_even', ['total_fixed_cost', 'selling_prices', 'monthly_demand', 'unit_cost', 'variable_cost'],
+                break_even,
+                ['unit_vc', 'avg_fixed_cost', 'be_units', 'be_total_units', 'be_mix_units'])
+    graph.node('be_lines', ['avg_fixed_cost', 'selling_prices', 'unit_vc', 'be_units'], break_even_lines)
+    return graph
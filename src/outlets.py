@@ -0,0 +1,123 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from model import default_outlet, evaluate
+
+# Per-recipe outlet inputs given as {recipe code: value}
+RECIPE_INPUTS = ['daily_demand', 'selling_prices', 'cooking_minutes']
+
+# Outlet inputs given as a single number
+SCALAR_INPUTS = ['hourly_rate', 'rent', 'salary']
+
+# Outlets handed to a worker at once, keeps the inter-process overhead low for many small outlets
+OUTLETS_PER_TASK = 64
+
+# Ingredient prices of a worker process, set once by the pool initializer and only read afterwards
+_worker_prices = None
+
+
+def outlet_from_config(book, config):
+    """Outlet of a configuration entry, inputs left out keep the recipe registry and dashboard defaults.
+
+    ``config`` holds the ``name``, optional numbers for ``rent``, ``salary`` and
+    ``hourly_rate``, ``daily_demand``, ``selling_prices`` and ``cooking_minutes``
+    as {recipe code: value} and ``quantities`` as {recipe code: {product: quantity}}.
+    """
+    rows = {code: r for r, code in enumerate(book.codes)}
+    columns = {product: i for i, product in enumerate(book.products)}
+    changes = {key: float(config[key]) for key in SCALAR_INPUTS if key in config}
+
+    for key in RECIPE_INPUTS:
+        if key in config:
+            values = getattr(book, key).copy()
+            for code, value in config[key].items():
+                values[rows[code]] = value
+            changes[key] = values
+
+    if 'quantities' in config:
+        quantities = book.quantities.copy()
+        for code, ingredients in config['quantities'].items():
+            for product, quantity in ingredients.items():
+                quantities[rows[code], columns[product]] = quantity
+        changes['quantities'] = quantities
+
+    return default_outlet(book, str(config['name']), **changes)
+
+
+def config_from_row(row):
+    """Configuration entry of a row of an outlet table.
+
+    Per-recipe inputs are columns named ``<input>.<recipe code>``, e.g.
+    ``daily_demand.TG``. Empty cells keep the default.
+    """
+    config = {}
+    for column, value in row.items():
+        if pd.isna(value):
+            continue
+        key, _, code = column.partition('.')
+        if code:
+            config.setdefault(key, {})[code] = value
+        else:
+            config[key] = value
+    return config
+
+
+def load_outlets(path, book):
+    """Read the outlets of a JSON configuration file or of a CSV outlet table."""
+    if path.lower().endswith('.csv'):
+        table = pd.read_csv(path)
+        return [outlet_from_config(book, config_from_row(row)) for row in table.to_dict('records')]
+    with open(path, encoding='utf-8') as file:
+        return [outlet_from_config(book, entry) for entry in json.load(file)['outlets']]
+
+
+def _init_worker(prices):
+    global _worker_prices
+    _worker_prices = prices
+    _worker_prices.flags.writeable = False
+
+
+def _evaluate_worker(outlet):
+    return evaluate(outlet, _worker_prices)
+
+
+def evaluate_outlets(outlets, prices, workers=None):
+    """Evaluate the financial model of every outlet, spread over a process pool.
+
+    The ingredient prices are sent to every worker once when it starts, not
+    with every outlet. Results are in the order of ``outlets``.
+    """
+    prices = np.asarray(prices, dtype=float)
+    workers = workers or os.cpu_count()
+    if workers == 1 or len(outlets) <= 1:
+        return [evaluate(outlet, prices) for outlet in outlets]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(prices,)) as executor:
+        return list(executor.map(_evaluate_worker, outlets, chunksize=OUTLETS_PER_TASK))
+
+
+def outlet_results(outlets, evaluations):
+    """One row per outlet with the monthly totals, the profit and the sales mix break-even."""
+    return pd.DataFrame({
+        'Outlet': [outlet.name for outlet in outlets],
+        'Total Revenue': [result.total_revenue for result in evaluations],
+        'Ingredients Cost': [result.total_ingredients_cost for result in evaluations],
+        'Variable Cost': [result.total_variable_cost for result in evaluations],
+        'Fixed Cost': [result.total_fixed_cost for result in evaluations],
+        'Total Cost': [result.total_cost for result in evaluations],
+        'Profit': [result.profit for result in evaluations],
+        'Sales Mix Break-even Units': [round(float(result.be_total_units), 0) for result in evaluations],
+    }).round(2)
+
+
+def portfolio_totals(results):
+    """Totals of all outlets of ``outlet_results`` and the number of outlets making a loss."""
+    money = ['Total Revenue', 'Ingredients Cost', 'Variable Cost', 'Fixed Cost', 'Total Cost', 'Profit']
+    # Object dtype keeps the counts integers next to the money values
+    totals = results[money].sum().round(2).astype(object)
+    totals['Outlets'] = len(results)
+    totals['Outlets with Loss'] = int((results['Profit'] < 0).sum())
+    return totals
@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from types import MappingProxyType
+
+from ingest import STORE_DIR, best_offers_path, load_current_best_offers
+from supplier import SUPPLIER_CSV_PATH, file_key, price_index, price_vector
+
+
+class PriceSnapshot:
+    """Immutable best offers and prices of one version of the supplier data.
+
+    Snapshots are shared by all sessions and threads. Readers must not modify
+    the offers, the price mapping is read-only.
+    """
+
+    def __init__(self, best_offers, key):
+        self.best_offers = best_offers
+        self.key = key
+        self.prices = MappingProxyType(price_index(best_offers))
+
+    def vector(self, products):
+        """Prices of ``products`` as a new float array, NaN where no offer exists."""
+        return price_vector(self.prices, products)
+
+
+class SharedPriceIndex:
+    """Process-wide price index, rebuilt once when the supplier data changes.
+
+    ``snapshot`` checks the source files at most every ``check_interval``
+    seconds. A rebuild happens in one thread while the others keep reading
+    the previous snapshot, and the new snapshot replaces it in a single
+    assignment.
+    """
+
+    def __init__(self, store_dir=STORE_DIR, csv_path=SUPPLIER_CSV_PATH, check_interval=1.0):
+        self.store_dir = store_dir
+        self.csv_path = csv_path
+        self.check_interval = check_interval
+        self.rebuilds = 0
+        self._snapshot = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _source_key(self):
+        # The materialized best offers of the store win over the supplier CSV, like load_current_best_offers
+        path = best_offers_path(self.store_dir)
+        return file_key(path) if os.path.exists(path) else file_key(self.csv_path)
+
+    def snapshot(self):
+        """The current snapshot, rebuilt first if the supplier data changed."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked < self.check_interval:
+            return snapshot
+
+        key = self._source_key()
+        if snapshot is not None and snapshot.key == key:
+            self._checked = time.monotonic()
+            return snapshot
+
+        if snapshot is not None and not self._lock.acquire(blocking=False):
+            # Another thread is rebuilding, keep serving the previous version meanwhile
+            return snapshot
+        if snapshot is None:
+            self._lock.acquire()
+        try:
+            if self._snapshot is None or self._snapshot.key != key:
+                self._snapshot = PriceSnapshot(load_current_best_offers(self.store_dir, self.csv_path), key)
+                self.rebuilds += 1
+            self._checked = time.monotonic()
+            return self._snapshot
+        finally:
+            self._lock.release()
+
+
+# Price index of this process, shared by every session of the dashboard
+_shared = SharedPriceIndex()
+
+
+def shared_price_index():
+    return _shared
@@ -0,0 +1,243 @@
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from arrow_store import load_shared_best_offers, reduce_offers
+from costing import DAYS_PER_MONTH
+from supplier import SUPPLIER_CSV_PATH, file_key
+
+# Demand is ordered per day, week and month of DAYS_PER_MONTH days
+DAYS_PER_WEEK = 7
+
+# Supplier unit of the unit spellings of the recipes and the supplier units in one of them
+UNITS = {
+    'pcs': ('PCS', 1.0), 'pcs.': ('PCS', 1.0), 'piece': ('PCS', 1.0), 'pieces': ('PCS', 1.0),
+    'g': ('G', 1.0), 'gram': ('G', 1.0), 'grams': ('G', 1.0), 'kg': ('G', 1000.0),
+    'ml': ('ML', 1.0), 'l': ('ML', 1000.0), 'liter': ('ML', 1000.0), 'liters': ('ML', 1000.0),
+}
+
+# Remainders below this quantity are rounding noise and need no extra pack
+QUANTITY_TOLERANCE = 1e-9
+
+# Cells of the cover table of one block of products, bounds the memory of long covers
+PLAN_BLOCK_CELLS = 2**22
+
+# Longest remainder of a product covered by the exact table, longer ones first get more packs of its best offer
+PLAN_COVER_UNITS = 2**13
+
+# Unit price differences below this are ties
+PRICE_TOLERANCE = 1e-9
+
+# Order lines of a purchase and the cost of every product next to the cost of the naive pick
+PurchasePlan = namedtuple('PurchasePlan', ['orders', 'costs'])
+
+
+def current_offers(offers):
+    """The most recent offer of every supplier for every product, the cheapest one if several share that date."""
+    pairs = offers.groupby(['Product', 'Supplier'], observed=True)
+    latest = offers[offers['Date of Offer'] == pairs['Date of Offer'].transform('max')]
+    cheapest = latest.groupby(['Product', 'Supplier'], observed=True)['Price per Unit'].idxmin()
+    return latest.loc[cheapest.values].reset_index(drop=True)
+
+
+@lru_cache(maxsize=4)
+def _cached_current_offers(path, mtime_ns, size):
+    # Reduced batch by batch, the current offers of a large file are bounded by products x suppliers
+    return reduce_offers(current_offers, path), load_shared_best_offers(path)
+
+
+def load_current_offers(path=SUPPLIER_CSV_PATH):
+    """Current offers of every supplier and the naive best offers, re-selected only when the file changed on disk."""
+    return _cached_current_offers(*file_key(path))
+
+
+def normalize_unit(unit):
+    """Supplier unit of a unit spelling and the number of supplier units in one ``unit``."""
+    return UNITS.get(str(unit).strip().lower(), (str(unit).strip().upper(), 1.0))
+
+
+def supplier_units(offers):
+    """Map every product to the unit of its supplier offers."""
+    return dict(zip(offers['Product'].astype(str), offers['Unit'].astype(str)))
+
+
+def unit_factors(products, units, product_units):
+    """Factors converting the recipe quantities of ``products`` into their supplier unit.
+
+    ``units`` maps products to their recipe unit and ``product_units`` to
+    their supplier unit. Products without offers keep their recipe unit,
+    products whose units cannot be converted get a NaN factor.
+    """
+    factors = np.ones(len(products))
+    for i, product in enumerate(products):
+        unit, factor = normalize_unit(units[product])
+        supplier_unit = normalize_unit(product_units.get(product, unit))[0]
+        factors[i] = factor if unit == supplier_unit else np.nan
+    return factors
+
+
+def demand_rollup(products, units, quantities, daily_demand, factors, days=DAYS_PER_MONTH):
+    """Daily, weekly and monthly demand of every ingredient summed over all recipes and outlets.
+
+    ``quantities`` is the recipe x ingredient quantity matrix and
+    ``daily_demand`` the daily demand of every recipe, or a stack of both
+    with one entry per outlet. The sum is a single matrix product over all
+    outlets and recipes. ``factors`` and ``units`` convert the totals into the
+    supplier units, see ``unit_factors``.
+    """
+    quantities = np.asarray(quantities, dtype=float)
+    daily = np.asarray(daily_demand, dtype=float).reshape(-1) @ quantities.reshape(-1, quantities.shape[-1]) * factors
+    return pd.DataFrame({
+        'Product': list(products),
+        'Unit': [normalize_unit(units[product])[0] for product in products],
+        'Daily': daily,
+        'Weekly': daily * DAYS_PER_WEEK,
+        'Monthly': daily * days,
+    })
+
+
+def _offer_matrix(offers, products):
+    # Pack sizes, pack prices and offer rows as product x offer matrices, padded where a product has fewer offers
+    column = pd.Categorical(offers['Product'].astype(str), categories=products).codes
+    offers = offers[column >= 0]
+    column = column[column >= 0]
+    order = np.argsort(column, kind='stable')
+    column = column[order]
+    slot = np.arange(len(column)) - np.searchsorted(column, column)
+    width = max(int(slot.max()) + 1 if len(slot) else 0, 1)
+
+    valid = np.zeros((len(products), width), dtype=bool)
+    sizes = np.ones((len(products), width))
+    pack_prices = np.zeros((len(products), width))
+    rows = np.full((len(products), width), -1)
+    valid[column, slot] = True
+    sizes[column, slot] = offers['Quantity'].to_numpy(dtype=float)[order]
+    pack_prices[column, slot] = np.round(offers['Price per Quantity'].to_numpy(dtype=float)[order], 4)
+    rows[column, slot] = order
+    return offers.reset_index(drop=True), valid, sizes, pack_prices, rows
+
+
+def _cover_counts(units, unit_prices, valid, need):
+    # Cheapest packs covering ``need`` units of every product, by dynamic programming over the units covered.
+    # Let b be the offer of the lowest unit price with packs of s_b units. Any s_b other packs hold a subset
+    # summing to a multiple of s_b, which packs of b cover for no more, so some optimum holds fewer than s_b
+    # other packs. Every other pack also costs its reduced cost more than the same units of b, and an optimum
+    # costs less than one pack of b more than the demand at the price of b, which bounds the other units too.
+    # Above what the other packs can cover an optimum holds a pack of b, hence only a short remainder needs
+    # the table and the rest is whole packs of b.
+    prices = np.where(valid, unit_prices, np.inf)
+    best = np.argmin(np.where(valid, unit_prices / units, np.inf), axis=1)
+    p = np.arange(len(need))
+    best_units = units[p, best]
+    best_price = unit_prices[p, best]
+
+    # Units the other packs of an optimum cover at most
+    reduced = np.where(valid, unit_prices - units * (best_price / best_units)[:, None], np.inf)
+    reduced[p, best] = np.inf
+    tied = (reduced <= PRICE_TOLERANCE).any(axis=1)
+    with np.errstate(divide='ignore'):
+        priced = np.floor(best_price[:, None] * units / np.maximum(reduced, PRICE_TOLERANCE)).max(axis=1)
+    other = (best_units - 1) * np.where(valid, units, 0).max(axis=1)
+    other = np.where(tied, other, np.minimum(other, priced + 1)).astype(np.int64)
+    threshold = other + 1
+    bulk = np.where(need >= threshold, (need - threshold) // best_units + 1, 0)
+    rest = np.maximum(need - bulk * best_units, 0)
+
+    # Remainders beyond the table length get more packs of the best offer, the plan is exact below it
+    cap = np.maximum(PLAN_COVER_UNITS, best_units)
+    extra = np.where(rest > cap, -((cap - rest) // best_units), 0)
+    bulk += extra
+    rest = np.maximum(rest - extra * best_units, 0)
+
+    counts = np.zeros(units.shape, dtype=np.int64)
+    counts[p, best] = bulk
+    # Products with the longest remainders first, so the first one of a block sets its length
+    order = np.argsort(-rest, kind='stable')
+    start = 0
+    while start < len(order):
+        length = int(rest[order[start]]) + 1
+        block = order[start:start + max(PLAN_BLOCK_CELLS // length, 1)]
+        start += len(block)
+        rows = np.arange(len(block))[:, None]
+        table = np.full((len(block), length), np.inf)
+        table[:, 0] = 0
+        choice = np.zeros((len(block), length), dtype=np.int64)
+        for x in range(1, length):
+            cost = table[rows, np.maximum(x - units[block], 0)] + prices[block]
+            choice[:, x] = cost.argmin(axis=1)
+            table[:, x] = cost[rows[:, 0], choice[:, x]]
+
+        # Walk back from the remainder of every product through the chosen packs
+        left = rest[block].copy()
+        while (left > 0).any():
+            active = np.flatnonzero(left > 0)
+            picked = choice[active, left[active]]
+            np.add.at(counts, (block[active], picked), 1)
+            left[active] = np.maximum(left[active] - units[block[active], picked], 0)
+    return counts
+
+
+def plan_purchases(offers, demand, naive_offers):
+    """Cheapest mix of supplier packs covering the demand of every product.
+
+    ``offers`` are the offers that can be ordered, ``demand`` maps products to
+    the quantity needed in their supplier unit and ``naive_offers`` holds the
+    one offer per product the dashboard prices with. Pack sizes count in whole
+    supplier units; the demand is covered by a dynamic program over the units
+    covered, run for all products at once in steps of the greatest common
+    divisor of their pack sizes. Whole packs of the offer with the lowest unit
+    price cover all but a remainder of at most ``PLAN_COVER_UNITS`` steps, so
+    the work does not grow with the demand or the pack sizes. The mix is the
+    cheapest unless an optimum needs a longer remainder, which takes awkward
+    pack sizes at nearly the same unit price.
+
+    Returns a PurchasePlan with one order line per product and offer and the
+    cost per product next to buying whole packs of the naive offer.
+    """
+    demand = pd.Series(demand, dtype=float)
+    products = list(demand.index)
+    offers, valid, sizes, pack_prices, rows = _offer_matrix(offers, products)
+    offered = valid.any(axis=1) & np.isfinite(demand.to_numpy())
+
+    # Pack sizes and demand in steps of the greatest common divisor of the pack sizes of a product
+    sizes = np.where(valid, np.round(sizes), 0).astype(np.int64)
+    step = np.maximum(np.gcd.reduce(sizes, axis=1), 1)
+    units = np.maximum(sizes // step[:, None], 1)
+    need = np.ceil(np.where(offered, demand.to_numpy(), 0) / step - QUANTITY_TOLERANCE).clip(0).astype(np.int64)
+    counts = _cover_counts(units, pack_prices, valid, need)
+    best_cost = (counts * pack_prices).sum(axis=1)
+
+    # Order lines, one per product and offer
+    p, k = np.nonzero(counts * offered[:, None])
+    lines = pd.DataFrame({'product': p, 'row': rows[p, k], 'Packs': counts[p, k]})
+    selected = offers.loc[lines['row'], ['Product', 'Unit', 'Supplier', 'Quantity', 'Price per Quantity']].reset_index(drop=True)
+    selected['Price per Quantity'] = np.round(selected['Price per Quantity'].to_numpy(dtype=float), 4)
+    selected['Packs'] = lines['Packs'].astype(int).to_numpy()
+    selected['Ordered'] = selected['Packs'] * selected['Quantity']
+    selected['Cost'] = np.round(selected['Packs'] * selected['Price per Quantity'], 2)
+
+    # Whole packs of the naive offer
+    naive = naive_offers.assign(Product=naive_offers['Product'].astype(str)).set_index('Product').reindex(products)
+    naive_sizes = naive['Quantity'].to_numpy(dtype=float)
+    naive_cost = np.ceil(demand.to_numpy() / naive_sizes - QUANTITY_TOLERANCE) * np.round(naive['Price per Quantity'].to_numpy(dtype=float), 4)
+
+    costs = pd.DataFrame({
+        'Product': products,
+        'Demand': demand.to_numpy(),
+        'Naive Supplier': naive['Supplier'].astype(object).to_numpy(),
+        'Naive Cost': np.round(naive_cost, 2),
+        'Cost': np.round(np.where(offered, best_cost, np.nan), 2),
+    })
+    costs['Savings'] = np.round(costs['Naive Cost'] - costs['Cost'], 2)
+    return PurchasePlan(selected, costs)
+
+
+def order_sheet(rollup, plan):
+    """One line per product and supplier pack with the demand it covers, products without offers included."""
+    sheet = rollup[['Product', 'Unit', 'Monthly']].rename(columns={'Monthly': 'Monthly Demand'})
+    orders = plan.orders.drop(columns='Unit').assign(Product=plan.orders['Product'].astype(str),
+                                                     Supplier=plan.orders['Supplier'].astype(str))
+    return sheet.merge(orders, on='Product', how='left')[
+        ['Product', 'Supplier', 'Unit', 'Monthly Demand', 'Quantity', 'Packs', 'Ordered', 'Price per Quantity', 'Cost']]
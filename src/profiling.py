@@ -0,0 +1,165 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# Files the section timings of every run are exported to when set, e.g. for a log shipper
+# and for the textfile collector of the Prometheus node exporter
+PROFILE_LOG_ENV = 'PROFILE_LOG'
+PROFILE_METRICS_ENV = 'PROFILE_METRICS'
+
+# Prefix of the exported Prometheus metrics
+METRIC_PREFIX = 'guacamole'
+
+
+# Memory tracing is process-wide, it runs while at least one run traces memory. ``joins`` counts
+# the runs that started tracing, a section overlapped by another tracing run has no valid peak.
+_tracing_lock = threading.Lock()
+_tracing = {'users': 0, 'joins': 0, 'started': False}
+
+
+def _start_tracing():
+    with _tracing_lock:
+        if _tracing['users'] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing['started'] = True
+        _tracing['users'] += 1
+        _tracing['joins'] += 1
+
+
+def _stop_tracing():
+    with _tracing_lock:
+        _tracing['users'] -= 1
+        # Tracing started outside of the timers, e.g. by a benchmark, keeps running
+        if _tracing['users'] == 0 and _tracing['started']:
+            tracemalloc.stop()
+            _tracing['started'] = False
+
+
+class SectionTimer:
+    """Wall time and memory of the consecutive sections of one script run.
+
+    Starting a section stops the one before, so the page can be timed with one
+    call at the top of every section. With ``memory`` the Python allocations
+    are traced, ``peak_memory`` holds the peak bytes allocated during every
+    section on top of what was allocated when it started. Sections that
+    overlap another run tracing memory get no peak, the peak is process-wide.
+    """
+
+    def __init__(self, memory=False):
+        self.timings = {}
+        self.peak_memory = {}
+        self.memory = memory
+        self._section = None
+        self._start = None
+        self._start_memory = 0
+        self._joins = None
+        self._tracing = memory
+        if memory:
+            _start_tracing()
+
+    def start(self, section):
+        self.stop()
+        self._section = section
+        if self.memory:
+            with _tracing_lock:
+                # The peak is process-wide, it is only reset and read while this run is the only one tracing
+                self._joins = _tracing['joins'] if _tracing['users'] == 1 else None
+                if self._joins is not None:
+                    tracemalloc.reset_peak()
+                    self._start_memory = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+
+    def stop(self):
+        if self._section is not None:
+            elapsed = time.perf_counter() - self._start
+            self.timings[self._section] = self.timings.get(self._section, 0.0) + elapsed
+            if self.memory:
+                with _tracing_lock:
+                    if self._joins is not None and self._joins == _tracing['joins']:
+                        peak = tracemalloc.get_traced_memory()[1] - self._start_memory
+                        self.peak_memory[self._section] = max(self.peak_memory.get(self._section, 0), peak)
+            self._section = None
+
+    def close(self):
+        """Stop the running section and release the memory tracing of this run."""
+        self.stop()
+        if self._tracing:
+            _stop_tracing()
+            self._tracing = False
+
+    def record(self):
+        """The timings of the run as one structured log record."""
+        return {
+            'time': time.time(),
+            'sections': [
+                {'section': section, 'seconds': seconds, 'peak_memory_bytes': self.peak_memory.get(section)}
+                for section, seconds in self.timings.items()
+            ],
+            'total_seconds': sum(self.timings.values()),
+        }
+
+
+class SectionStats:
+    """Section timings summed over all runs of the process, shared by all sessions."""
+
+    def __init__(self):
+        self.seconds = {}
+        self.runs = {}
+        self.peak_memory = {}
+        self._lock = threading.Lock()
+
+    def add(self, timer):
+        with self._lock:
+            for section, seconds in timer.timings.items():
+                self.seconds[section] = self.seconds.get(section, 0.0) + seconds
+                self.runs[section] = self.runs.get(section, 0) + 1
+            self.peak_memory.update(timer.peak_memory)
+
+    def prometheus(self):
+        """The statistics in the Prometheus text exposition format."""
+        def label(section):
+            return section.replace('\\', '\\\\').replace('"', '\\"')
+
+        with self._lock:
+            lines = [
+                f'# HELP {METRIC_PREFIX}_section_seconds Wall time of the dashboard sections.',
+                f'# TYPE {METRIC_PREFIX}_section_seconds summary',
+            ]
+            for section, seconds in self.seconds.items():
+                lines.append(f'{METRIC_PREFIX}_section_seconds_sum{{section="{label(section)}"}} {seconds:.6f}')
+                lines.append(f'{METRIC_PREFIX}_section_seconds_count{{section="{label(section)}"}} {self.runs[section]}')
+            if self.peak_memory:
+                lines.append(f'# HELP {METRIC_PREFIX}_section_peak_memory_bytes Peak Python allocations of the last profiled run of the sections.')
+                lines.append(f'# TYPE {METRIC_PREFIX}_section_peak_memory_bytes gauge')
+                for section, peak in self.peak_memory.items():
+                    lines.append(f'{METRIC_PREFIX}_section_peak_memory_bytes{{section="{label(section)}"}} {peak}')
+        return '\n'.join(lines) + '\n'
+
+
+# Statistics of this process
+stats = SectionStats()
+
+
+def write_log(record, path):
+    """Append a structured log record as one line of JSON."""
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write(json.dumps(record) + '\n')
+
+
+def write_metrics(text, path):
+    """Replace the Prometheus text file at once, so a scrape never reads half of it."""
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        file.write(text)
+    os.replace(tmp_path, path)
+
+
+def export(timer):
+    """Add the timings of a finished run to the process statistics and write the configured exports."""
+    stats.add(timer)
+    if os.environ.get(PROFILE_LOG_ENV):
+        write_log(timer.record(), os.environ[PROFILE_LOG_ENV])
+    if os.environ.get(PROFILE_METRICS_ENV):
+        write_metrics(stats.prometheus(), os.environ[PROFILE_METRICS_ENV])
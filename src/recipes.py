@@ -0,0 +1,63 @@
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from supplier import file_key
+
+# Default location of the recipe registry
+RECIPES_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'recipes.json')
+
+
+class RecipeBook:
+    """Recipes of the menu as a recipe x ingredient quantity matrix.
+
+    Row ``r`` of ``quantities`` holds the ingredient quantities of recipe
+    ``codes[r]``, column ``i`` belongs to the supplier product ``products[i]``.
+    ``uses`` marks which ingredients are part of which recipe.
+    """
+
+    def __init__(self, recipes):
+        self.codes = [recipe['code'] for recipe in recipes]
+        self.names = [recipe['name'] for recipe in recipes]
+        self.daily_demand = np.array([recipe['daily_demand'] for recipe in recipes], dtype=float)
+        self.selling_prices = np.array([recipe['selling_price'] for recipe in recipes], dtype=float)
+        self.steps = [recipe.get('steps', []) for recipe in recipes]
+        self.cooking_minutes = np.array([sum(step['minutes'] + step['seconds'] / 60 for step in steps)
+                                         for steps in self.steps], dtype=float)
+
+        # Ingredients are ordered by their first appearance in the menu
+        self.products = []
+        self.units = {}
+        for recipe in recipes:
+            for ingredient in recipe['ingredients']:
+                if ingredient['product'] not in self.units:
+                    self.products.append(ingredient['product'])
+                    self.units[ingredient['product']] = ingredient['unit']
+
+        columns = {product: i for i, product in enumerate(self.products)}
+        self.quantities = np.zeros((len(recipes), len(self.products)))
+        self.uses = np.zeros((len(recipes), len(self.products)), dtype=bool)
+        for r, recipe in enumerate(recipes):
+            for ingredient in recipe['ingredients']:
+                self.quantities[r, columns[ingredient['product']]] = ingredient['quantity']
+                self.uses[r, columns[ingredient['product']]] = True
+
+    def __len__(self):
+        return len(self.codes)
+
+    def ingredients(self, r):
+        """Return the column indices of the ingredients of recipe ``r``."""
+        return np.flatnonzero(self.uses[r])
+
+
+@lru_cache(maxsize=4)
+def _cached_recipes(path, mtime_ns, size):
+    with open(path, encoding='utf-8') as file:
+        return RecipeBook(json.load(file)['recipes'])
+
+
+def load_recipes(path=RECIPES_PATH):
+    """Load the recipe registry, re-reading it only when the file changed on disk."""
+    return _cached_recipes(*file_key(path))
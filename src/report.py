@@ -0,0 +1,80 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from arrow_store import load_shared_best_offers, load_shared_offers
+from outlets import evaluate_outlets, load_outlets, outlet_results, portfolio_totals
+from procurement import current_offers, demand_rollup, order_sheet, plan_purchases, supplier_units, unit_factors
+from recipes import RECIPES_PATH, load_recipes
+from supplier import price_index, price_vector
+
+
+def break_even_report(book, outlets, evaluations):
+    """One row per outlet and recipe with the break-even of the recipe."""
+    frames = []
+    for outlet, result in zip(outlets, evaluations):
+        frames.append(pd.DataFrame({
+            'Outlet': outlet.name,
+            'Recipe': book.codes,
+            'Name': book.names,
+            'Selling Price': outlet.selling_prices,
+            'Monthly Demand': result.monthly_demand,
+            'Unit Ingredient Cost': np.round(result.unit_cost, 2),
+            'Avg. Unit Variable Cost': result.unit_vc,
+            'Avg. Fixed Cost': result.avg_fixed_cost,
+            'Break-even Units': result.be_units,
+            'Sales Mix Break-even Units': np.round(result.be_mix_units, 0),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def portfolio_order_sheet(book, outlets, offers, best_offers):
+    """Order sheet covering the monthly ingredient demand of all outlets together."""
+    factors = unit_factors(book.products, book.units, supplier_units(best_offers))
+    rollup = demand_rollup(book.products, book.units, np.stack([outlet.quantities for outlet in outlets]),
+                           np.stack([outlet.daily_demand for outlet in outlets]), factors)
+    return order_sheet(rollup, plan_purchases(current_offers(offers), rollup.set_index('Product')['Monthly'], best_offers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write break-even and profit reports for many outlets.')
+    parser.add_argument('config', help='JSON file or CSV table with the outlets')
+    parser.add_argument('--supplier', default=None,
+                        help='supplier CSV file, by default the offer store or the bundled supplier file')
+    parser.add_argument('--recipes', default=RECIPES_PATH, help='recipe registry')
+    parser.add_argument('--output', default='reports', help='directory of the reports')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='number of worker processes')
+    args = parser.parse_args()
+
+    if args.supplier is None:
+        from ingest import best_offers_path, load_current_best_offers, load_history
+        best_offers = load_current_best_offers()
+        offers = load_history() if os.path.exists(best_offers_path()) else load_shared_offers()
+    else:
+        best_offers = load_shared_best_offers(args.supplier)
+        offers = load_shared_offers(args.supplier)
+
+    book = load_recipes(args.recipes)
+    prices = price_vector(price_index(best_offers), book.products)
+    missing = [product for product, price in zip(book.products, prices) if np.isnan(price)]
+    if missing:
+        print(f"No supplier offer for {', '.join(missing)}, their costs are NaN.", file=sys.stderr)
+
+    outlets = load_outlets(args.config, book)
+    evaluations = evaluate_outlets(outlets, prices, args.workers)
+    results = outlet_results(outlets, evaluations)
+
+    os.makedirs(args.output, exist_ok=True)
+    break_even_report(book, outlets, evaluations).to_csv(os.path.join(args.output, 'break-even.csv'), index=False)
+    results.to_csv(os.path.join(args.output, 'profit.csv'), index=False)
+    portfolio_totals(results).to_frame('Portfolio').to_csv(os.path.join(args.output, 'portfolio.csv'))
+    portfolio_order_sheet(book, outlets, offers, best_offers).to_csv(os.path.join(args.output, 'order-sheet.csv'),
+                                                                     index=False)
+    print(f'{len(outlets)} outlets written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from arrow_store import offer_batches
+from flow import flow_graph
+from simulation import ProfitModel, fit_price_moments, price_moments, simulate, summarize
+
+# Input combinations remembered per section, the least recently used are evicted first
+SECTION_CACHE_ENTRIES = 64
+
+
+@st.cache_data(max_entries=SECTION_CACHE_ENTRIES, show_spinner=False)
+def flow_graph_section(codes, products, values):
+    """DOT source of the Calculation Flow graph."""
+    return flow_graph(codes, products).source(values)
+
+
+@st.cache_data(max_entries=SECTION_CACHE_ENTRIES, show_spinner=False)
+def simulation_section(supplier_key, products, quantities, ingredient_prices, monthly_demand, selling_prices,
+                       cooking_minutes, hourly_rate, fixed_cost, draws, seed, _workers):
+    """Summary, histogram bins and seconds of the Profit Simulation.
+
+    Ingredient prices follow the offer history of the supplier file with the
+    ``file_key`` ``supplier_key``, ``ingredient_prices`` where a product has
+    none. The draws only depend on the inputs, the draws and the seed, so the
+    number of workers is left out of the cache key.
+    """
+    # Price moments add up over the record batches, so a large supplier file is never loaded at once
+    moments = pd.concat([price_moments(offers) for offers in offer_batches(supplier_key[0])]).groupby(level=0).sum()
+    log_price_mean, log_price_std = fit_price_moments(moments, list(products))
+    no_history = np.isnan(log_price_mean)
+    log_price_mean[no_history] = np.log(np.asarray(ingredient_prices, dtype=float)[no_history])
+    log_price_std[no_history] = 0.0
+    model = ProfitModel(quantities, log_price_mean, log_price_std, monthly_demand, selling_prices, cooking_minutes,
+                        hourly_rate, fixed_cost)
+
+    start = time.perf_counter()
+    profits = simulate(model, draws, seed, _workers)
+    seconds = time.perf_counter() - start
+
+    # Histogram is binned here so only the bins are kept and sent to the browser
+    counts, edges = np.histogram(profits, bins=100)
+    return summarize(profits), counts, edges, seconds
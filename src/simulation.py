@@ -0,0 +1,131 @@
+import argparse
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from costing import DAYS_PER_MONTH
+
+# Number of draws evaluated by one task, independent of the number of workers
+CHUNK_SIZE = 100_000
+
+# Inputs of the simulation, arrays are per recipe or per ingredient
+ProfitModel = namedtuple('ProfitModel', [
+    'quantities', 'log_price_mean', 'log_price_std', 'monthly_demand',
+    'selling_prices', 'cooking_minutes', 'hourly_rate', 'fixed_cost',
+])
+
+
+def price_moments(offers):
+    """Count, sum and sum of squares of the log prices per unit of every product.
+
+    The moments of parts of the offers add up to those of all offers, e.g. of
+    the record batches of a large supplier file.
+    """
+    valid = offers[offers['Price per Unit'] > 0]
+    log_prices = np.log(valid['Price per Unit'].astype(float))
+    moments = log_prices.to_frame('sum').assign(count=1.0, squares=log_prices ** 2)
+    return moments.groupby(valid['Product'].astype(str))[['count', 'sum', 'squares']].sum()
+
+
+def fit_price_moments(moments, products):
+    """Mean and standard deviation of the log prices of ``products`` from their ``price_moments``."""
+    moments = moments.reindex(products)
+    count = moments['count'].to_numpy()
+    mean = moments['sum'].to_numpy() / count
+    variance = np.where(count > 1, moments['squares'].to_numpy() / count - mean ** 2, 0.0)
+    return mean, np.sqrt(np.maximum(variance, 0.0))
+
+
+def fit_price_distributions(offers, products):
+    """Fit a log-normal price per unit distribution to the offer history of every product.
+
+    Returns the mean and standard deviation of the log prices, NaN for products
+    without offers and a zero deviation for products with a single price.
+    """
+    return fit_price_moments(price_moments(offers), products)
+
+
+def _simulate_chunk(model, draws, seed):
+    rng = np.random.default_rng(seed)
+
+    # Ingredient prices and monthly demand of every draw
+    prices = np.exp(rng.normal(model.log_price_mean, model.log_price_std, size=(draws, len(model.log_price_mean))))
+    demand = rng.poisson(model.monthly_demand, size=(draws, len(model.monthly_demand)))
+
+    unit_cost = prices @ model.quantities.T + model.cooking_minutes / 60 * model.hourly_rate
+    return (demand * (model.selling_prices - unit_cost)).sum(axis=1) - model.fixed_cost
+
+
+def simulate(model, draws, seed=0, workers=None):
+    """Draw ``draws`` monthly profits, spread over a process pool in chunks.
+
+    Every chunk gets its own child of the seed, so results only depend on the
+    seed and the number of draws, not on the number of workers.
+    """
+    sizes = [CHUNK_SIZE] * (draws // CHUNK_SIZE)
+    if draws % CHUNK_SIZE:
+        sizes.append(draws % CHUNK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers == 1 or len(sizes) == 1:
+        chunks = [_simulate_chunk(model, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_simulate_chunk, [model] * len(sizes), sizes, seeds))
+    return np.concatenate(chunks) if chunks else np.empty(0)
+
+
+def summarize(profits):
+    """Summary statistics of simulated profits."""
+    return {
+        'draws': len(profits),
+        'mean': float(profits.mean()),
+        'std': float(profits.std()),
+        'p5': float(np.percentile(profits, 5)),
+        'p50': float(np.percentile(profits, 50)),
+        'p95': float(np.percentile(profits, 95)),
+        'break_even_probability': float((profits >= 0).mean()),
+    }
+
+
+def benchmark(model, draws, seed=0, workers=None):
+    """Return the number of simulated draws per second."""
+    start = time.perf_counter()
+    simulate(model, draws, seed, workers)
+    return draws / (time.perf_counter() - start)
+
+
+def default_model():
+    """Simulation inputs from the recipe registry, the supplier history and the dashboard defaults."""
+    from model import DEFAULT_HOURLY_RATE, DEFAULT_RENT, DEFAULT_SALARY
+    from recipes import load_recipes
+    from supplier import load_offers
+
+    book = load_recipes()
+    mean, std = fit_price_distributions(load_offers(), book.products)
+    return ProfitModel(book.quantities, mean, std, book.daily_demand * DAYS_PER_MONTH, book.selling_prices,
+                       book.cooking_minutes, DEFAULT_HOURLY_RATE, DEFAULT_RENT + DEFAULT_SALARY)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo simulation of the monthly profit.')
+    parser.add_argument('--draws', type=int, default=1_000_000, help='number of simulated months')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='number of worker processes')
+    args = parser.parse_args()
+
+    model = default_model()
+    start = time.perf_counter()
+    profits = simulate(model, args.draws, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+
+    for key, value in summarize(profits).items():
+        print(f'{key}: {value:,.4f}' if isinstance(value, float) else f'{key}: {value:,}')
+    print(f'draws per second: {args.draws / elapsed:,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import pandas as pd
+
+from supplier import CATEGORICAL_COLUMNS, TEXT_DTYPES, clean_offers, parse_offer_dates, select_best_offers
+
+# Offer rows parsed at once, bounds the memory of a streaming pass independently of the file size
+CHUNK_ROWS = 100_000
+
+
+def _chunks(path, chunk_rows, columns=None):
+    return pd.read_csv(path, sep=';', decimal=',', usecols=columns, chunksize=chunk_rows, dtype=TEXT_DTYPES)
+
+
+def offer_date_index(path, chunk_rows=CHUNK_ROWS):
+    """Parsed date of every distinct (supplier, date string) pair of a supplier file.
+
+    Whether a supplier writes day first or month first depends on all of its
+    dates, so they are collected in a first pass. Only the distinct pairs are
+    kept, their number is bounded by suppliers x days and not by the file size.
+    """
+    pairs = pd.DataFrame(columns=['Supplier', 'Date of Offer'], dtype=object)
+    for chunk in _chunks(path, chunk_rows, ['Supplier', 'Date of Offer']):
+        chunk = chunk.astype(object).drop_duplicates()
+        pairs = pd.concat([pairs, chunk], ignore_index=True).drop_duplicates(ignore_index=True)
+    dates = parse_offer_dates(pairs['Date of Offer'], pairs['Supplier'])[0]
+    return pd.Series(dates.to_numpy(), index=pd.MultiIndex.from_frame(pairs))
+
+
+def offer_categories(path, chunk_rows=CHUNK_ROWS):
+    """Categorical type of every text column holding all values of a supplier file, e.g. its products."""
+    values = {column: set() for column in CATEGORICAL_COLUMNS}
+    for chunk in _chunks(path, chunk_rows, CATEGORICAL_COLUMNS):
+        for column in CATEGORICAL_COLUMNS:
+            values[column].update(chunk[column].cat.categories)
+    return {column: pd.CategoricalDtype(sorted(values[column])) for column in CATEGORICAL_COLUMNS}
+
+
+def _clean_chunk(chunk, date_index):
+    pairs = pd.MultiIndex.from_arrays([chunk['Supplier'].astype(object), chunk['Date of Offer'].astype(object)])
+    dates = pd.Series(date_index.reindex(pairs).to_numpy(), index=chunk.index)
+    return clean_offers(chunk, dates)
+
+
+def stream_offers(path, chunk_rows=CHUNK_ROWS):
+    """The offers of ``read_offers(path)`` as chunks of ``chunk_rows`` offers, parsed in bounded memory.
+
+    Dates are parsed over the whole file and the text columns of all chunks
+    share the categories of the whole file, so the chunks concatenate to the
+    table of ``read_offers``.
+    """
+    date_index = offer_date_index(path, chunk_rows)
+    categories = offer_categories(path, chunk_rows)
+    empty = True
+    for chunk in _chunks(path, chunk_rows):
+        empty = False
+        yield _clean_chunk(chunk, date_index).astype(categories)
+    if empty:
+        yield clean_offers(pd.read_csv(path, sep=';', decimal=',', nrows=0, dtype=TEXT_DTYPES)).astype(categories)
+
+
+def stream_best_offers(path, chunk_rows=CHUNK_ROWS):
+    """The table of ``select_best_offers(read_offers(path))`` computed in bounded memory.
+
+    The file is read in chunks of ``chunk_rows`` offers. A running table keeps
+    the latest, then cheapest offer of every product seen so far, and the best
+    offers of every chunk are reduced into it with ``select_best_offers``. The
+    running offers come before the offers of the chunk, so ties resolve to the
+    first offer of the file like in a single pass. The text columns of the
+    result are categoricals of the values they hold.
+    """
+    date_index = offer_date_index(path, chunk_rows)
+    best = None
+    for chunk in _chunks(path, chunk_rows):
+        offers = select_best_offers(_clean_chunk(chunk, date_index))
+        for column in CATEGORICAL_COLUMNS:
+            offers[column] = offers[column].astype(object)
+        best = offers if best is None else pd.concat([best, offers], ignore_index=True)
+        best = select_best_offers(best)
+
+    if best is None:
+        return select_best_offers(clean_offers(pd.read_csv(path, sep=';', decimal=',', nrows=0, dtype=TEXT_DTYPES)))
+    for column in CATEGORICAL_COLUMNS:
+        best[column] = best[column].astype('category')
+    return best
@@ -0,0 +1,173 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Default location of the supplier offers
+SUPPLIER_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'supplier-ingredients.CSV')
+
+# Columns that are stored as pandas categoricals
+CATEGORICAL_COLUMNS = ['Product', 'Unit', 'Supplier']
+
+# Columns using a decimal comma in the supplier files
+PRICE_COLUMNS = ['Price per Quantity', 'Price per Unit']
+
+# Integer columns that may carry thousands separators like "10,001"
+INTEGER_COLUMNS = ['Product-ID', 'Quantity']
+
+# Columns read as text, so a thousands separator is never taken for the decimal comma of the prices
+TEXT_DTYPES = {column: 'category' for column in CATEGORICAL_COLUMNS + INTEGER_COLUMNS + ['Date of Offer']}
+
+# Supplier files of at least this size are parsed in chunks into their Arrow tables, see arrow_store.py
+STREAMING_FILE_BYTES = 512 * 2**20
+
+# Compact in-memory types of the offer columns, prices carry at most four decimals
+INTEGER_DTYPE = 'int32'
+PRICE_DTYPE = 'float32'
+PRICE_DECIMALS = 4
+
+
+def file_key(path):
+    """Return the (path, mtime, size) triple used to detect changed supplier files."""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def _to_int(column):
+    # Integer columns may carry thousands separators like "10,001"
+    if isinstance(column.dtype, pd.CategoricalDtype) and column.notna().all():
+        # Only the distinct values are converted
+        values = _to_int(pd.Series(column.cat.categories.astype(str))).to_numpy()
+        return pd.Series(values[column.cat.codes.to_numpy()], index=column.index)
+    if not pd.api.types.is_numeric_dtype(column):
+        column = column.astype(str).str.replace(',', '', regex=False)
+    return pd.to_numeric(column).astype(INTEGER_DTYPE)
+
+
+def parse_offer_dates(dates, blocks=None):
+    """Parse a mixed day-first/month-first date column in one vectorized pass.
+
+    Dates are split into blocks by ``blocks`` (e.g. the supplier) and by their
+    style: zero padded (07.08.2021) or unpadded (8.7.2021). A block is day first
+    or month first when one of its dates can only be read that way. Blocks
+    without such evidence follow the convention of the supplier files: padded
+    dates are day first, unpadded ones month first. Ambiguous dates in blocks
+    with conflicting evidence and malformed dates are left as NaT.
+
+    Returns the parsed dates and a boolean mask of the unresolved rows.
+    """
+    # Only the distinct date strings are split up
+    codes, uniques = pd.factorize(dates)
+    uniques = pd.Index(uniques).astype(str).str.strip()
+    unique_parts = pd.Series(uniques).str.extract(r'^(\d{1,2})[./-](\d{1,2})[./-](\d{4})$')
+    unique_first = pd.to_numeric(unique_parts[0]).to_numpy()
+    unique_second = pd.to_numeric(unique_parts[1]).to_numpy()
+    unique_year = pd.to_numeric(unique_parts[2]).to_numpy()
+    unique_padded = pd.Series(uniques).str.match(r'^\d{2}[./-]\d{2}[./-]').to_numpy()
+
+    # Missing values are factorized to -1 and stay unresolved
+    valid = codes >= 0
+    codes = np.where(valid, codes, 0)
+    first = np.where(valid, np.append(unique_first, np.nan)[codes], np.nan)
+    second = np.where(valid, np.append(unique_second, np.nan)[codes], np.nan)
+    year = np.where(valid, np.append(unique_year, np.nan)[codes], np.nan)
+    padded = valid & np.append(unique_padded, False)[codes]
+
+    # Evidence per block of dates that can only be read one way
+    only_day_first = (first > 12) & (second <= 12)
+    only_month_first = (second > 12) & (first <= 12)
+    block_codes = pd.factorize(blocks, use_na_sentinel=False)[0].astype(np.int64) if blocks is not None else np.zeros(len(codes), dtype=np.int64)
+    block_codes = block_codes * 2 + padded
+    block_day_first = np.bincount(block_codes, weights=only_day_first)[block_codes] > 0
+    block_month_first = np.bincount(block_codes, weights=only_month_first)[block_codes] > 0
+
+    # Ambiguous dates follow their block, or the padding convention without evidence
+    ambiguous = (first <= 12) & (second <= 12)
+    ambiguous_day_first = np.where(block_day_first | block_month_first, block_day_first, padded)
+    conflicting = ambiguous & block_day_first & block_month_first
+    day_first = only_day_first | (ambiguous & ambiguous_day_first)
+
+    parts = pd.DataFrame({
+        'year': np.where(conflicting, np.nan, year),
+        'month': np.where(day_first, second, first),
+        'day': np.where(day_first, first, second),
+    })
+    parsed = pd.to_datetime(parts, errors='coerce')
+    parsed.index = dates.index
+    return parsed, parsed.isna().to_numpy()
+
+
+def unresolved_dates(offers):
+    """Return the offers whose date could not be parsed."""
+    return offers[offers['Date of Offer'].isna()]
+
+
+def clean_offers(df, dates=None):
+    """Convert a raw supplier offer table into compact typed columns.
+
+    IDs and quantities are int32, prices float32, dates datetime64 and the
+    text columns categoricals. ``dates`` are the offer dates when they were
+    parsed beforehand, e.g. over a whole file that is read in chunks.
+    """
+    df = df.copy()
+    for column in INTEGER_COLUMNS:
+        df[column] = _to_int(df[column])
+    for column in PRICE_COLUMNS:
+        if df[column].dtype == object:
+            df[column] = df[column].astype(str).str.replace(',', '.', regex=False)
+        df[column] = pd.to_numeric(df[column]).astype(PRICE_DTYPE)
+    df['Date of Offer'] = parse_offer_dates(df['Date of Offer'], df['Supplier'])[0] if dates is None else dates
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype('category')
+    return df
+
+
+def read_offers(path):
+    """Parse a semicolon separated supplier file without any caching."""
+    # Text columns are read as categoricals right away, so no column of Python strings is built
+    df = pd.read_csv(path, sep=';', decimal=',', dtype=TEXT_DTYPES)
+    return clean_offers(df)
+
+
+@lru_cache(maxsize=4)
+def _cached_offers(path, mtime_ns, size):
+    return read_offers(path)
+
+
+def load_offers(path=SUPPLIER_CSV_PATH):
+    """Load the supplier offers, re-parsing only when the file changed on disk.
+
+    The returned DataFrame is shared between reruns and must not be mutated.
+    """
+    return _cached_offers(*file_key(path))
+
+
+def select_best_offers(offers):
+    """Pick the cheapest of the most recent offers for every product."""
+    products = offers.groupby('Product', observed=True)
+    latest = offers[offers['Date of Offer'] == products['Date of Offer'].transform('max')]
+    cheapest = latest.groupby('Product', observed=True)['Price per Unit'].idxmin()
+    return latest.loc[cheapest.values].reset_index(drop=True)
+
+
+def price_index(best_offers):
+    """Map every product name to its selected price per unit."""
+    # Rounding recovers the decimal prices from their float32 representation
+    prices = np.round(best_offers['Price per Unit'].to_numpy(dtype=float), PRICE_DECIMALS)
+    return dict(zip(best_offers['Product'].astype(str), prices))
+
+
+def price_vector(prices, products):
+    """Return the prices of ``products`` as a float array, NaN where no offer exists."""
+    return np.array([prices.get(product, np.nan) for product in products], dtype=float)
+
+
+@lru_cache(maxsize=4)
+def _cached_best_offers(path, mtime_ns, size):
+    return select_best_offers(_cached_offers(path, mtime_ns, size))
+
+
+def load_best_offers(path=SUPPLIER_CSV_PATH):
+    """Load the best offer per product, re-selecting only when the file changed on disk."""
+    return _cached_best_offers(*file_key(path))
@@ -0,0 +1,58 @@
+from collections import namedtuple
+
+import numpy as np
+
+from costing import DAYS_PER_MONTH
+
+# Results of a scenario sweep, the arrays are indexed [price, demand, ingredient price, rent]
+Sweep = namedtuple('Sweep', [
+    'price_factors', 'demand_factors', 'ingredient_prices', 'rents',
+    'revenue', 'cost', 'profit', 'be_units',
+])
+
+
+def sweep(quantities, prices, demand, selling_prices, cooking_minutes, hourly_rate, salary,
+          price_factors, demand_factors, ingredient, ingredient_prices, rents, days=DAYS_PER_MONTH):
+    """Evaluate the monthly financial model over a grid of scenarios at once.
+
+    Every scenario scales all selling prices by a factor of ``price_factors``,
+    all daily demand by a factor of ``demand_factors``, sets the price of the
+    ingredient column ``ingredient`` to a value of ``ingredient_prices`` and
+    the rent to a value of ``rents``. The other inputs are those of
+    ``costing.cost_model``.
+
+    ``be_units`` are the total monthly units needed to break even at the
+    scenario's sales mix, NaN where the recipes do not cover their variable costs.
+    """
+    quantities = np.asarray(quantities, dtype=float)
+    price_factors = np.asarray(price_factors, dtype=float)
+    demand_factors = np.asarray(demand_factors, dtype=float)
+    ingredient_prices = np.asarray(ingredient_prices, dtype=float)
+    rents = np.asarray(rents, dtype=float)
+
+    # Monthly demand of every recipe per demand factor: (demand, recipe)
+    monthly_demand = np.outer(demand_factors, np.asarray(demand, dtype=float) * days)
+
+    # Ingredient cost of one unit of every recipe per ingredient price: (ingredient price, recipe)
+    other_prices = np.where(np.arange(quantities.shape[1]) == ingredient, 0.0, np.asarray(prices, dtype=float))
+    unit_cost = (quantities @ other_prices)[None, :] + np.outer(ingredient_prices, quantities[:, ingredient])
+
+    revenue = np.outer(price_factors, monthly_demand @ np.asarray(selling_prices, dtype=float))
+    ingredient_cost = monthly_demand @ unit_cost.T
+    cooking_cost = monthly_demand @ np.asarray(cooking_minutes, dtype=float) / 60 * hourly_rate
+    fixed_cost = rents + salary
+
+    # Broadcast to (price, demand, ingredient price, rent)
+    variable_cost = ingredient_cost + cooking_cost[:, None]
+    cost = variable_cost[None, :, :, None] + fixed_cost[None, None, None, :]
+    profit = revenue[:, :, None, None] - cost
+
+    # Break-even at the sales mix of the scenario: fixed cost over contribution per unit
+    contribution = revenue[:, :, None] - variable_cost[None, :, :]
+    total_units = monthly_demand.sum(axis=1)[None, :, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        unit_contribution = np.where(contribution > 0, contribution / total_units, np.nan)
+    be_units = fixed_cost[None, None, None, :] / unit_contribution[..., None]
+
+    cost = np.broadcast_to(cost, profit.shape)
+    return Sweep(price_factors, demand_factors, ingredient_prices, rents, revenue, cost, profit, be_units)